@@ -29,6 +29,124 @@ class AnalyticsEvent:
     properties: Optional[Dict] = None
     timestamp: Optional[datetime] = None
 
+# Analytics schema, applied in a single executescript() call
+ANALYTICS_DDL = '''
+-- Analytics events table
+CREATE TABLE IF NOT EXISTS analytics_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    venue_id INTEGER,
+    content_id INTEGER,
+    user_session TEXT,
+    ip_address TEXT,
+    user_agent TEXT,
+    referrer TEXT,
+    properties TEXT, -- JSON string
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (venue_id) REFERENCES venues (id),
+    FOREIGN KEY (content_id) REFERENCES content (id)
+);
+
+-- User sessions table
+CREATE TABLE IF NOT EXISTS user_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT UNIQUE NOT NULL,
+    ip_address TEXT,
+    user_agent TEXT,
+    referrer TEXT,
+    start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    page_views INTEGER DEFAULT 0,
+    duration INTEGER DEFAULT 0, -- seconds
+    is_active BOOLEAN DEFAULT TRUE
+);
+
+-- Daily venue stats
+CREATE TABLE IF NOT EXISTS daily_venue_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    venue_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    views INTEGER DEFAULT 0,
+    unique_visitors INTEGER DEFAULT 0,
+    content_views INTEGER DEFAULT 0,
+    shares INTEGER DEFAULT 0,
+    favorites INTEGER DEFAULT 0,
+    UNIQUE(venue_id, date),
+    FOREIGN KEY (venue_id) REFERENCES venues (id)
+);
+
+-- Daily content stats
+CREATE TABLE IF NOT EXISTS daily_content_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_id INTEGER NOT NULL,
+    venue_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    views INTEGER DEFAULT 0,
+    unique_visitors INTEGER DEFAULT 0,
+    shares INTEGER DEFAULT 0,
+    engagement_time INTEGER DEFAULT 0, -- seconds
+    UNIQUE(content_id, date),
+    FOREIGN KEY (content_id) REFERENCES content (id),
+    FOREIGN KEY (venue_id) REFERENCES venues (id)
+);
+
+-- Popular searches
+CREATE TABLE IF NOT EXISTS search_analytics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    search_term TEXT NOT NULL,
+    search_type TEXT, -- venue, neighborhood, content
+    results_count INTEGER DEFAULT 0,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Geographic analytics
+CREATE TABLE IF NOT EXISTS geographic_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ip_address TEXT,
+    estimated_location TEXT, -- city, country
+    venue_id INTEGER,
+    date DATE DEFAULT (date('now')),
+    views INTEGER DEFAULT 1,
+    FOREIGN KEY (venue_id) REFERENCES venues (id)
+);
+
+-- Performance metrics
+CREATE TABLE IF NOT EXISTS performance_metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    metric_name TEXT NOT NULL,
+    metric_value REAL NOT NULL,
+    metadata TEXT, -- JSON string
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes for better query performance
+CREATE INDEX IF NOT EXISTS idx_analytics_events_timestamp ON analytics_events(timestamp);
+CREATE INDEX IF NOT EXISTS idx_ae_venue_ts ON analytics_events(venue_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_ae_content_ts ON analytics_events(content_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_ae_type_ts ON analytics_events(event_type, timestamp DESC);
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS idx_analytics_events_venue;
+DROP INDEX IF EXISTS idx_analytics_events_content;
+DROP INDEX IF EXISTS idx_analytics_events_type;
+CREATE INDEX IF NOT EXISTS idx_daily_venue_stats_date ON daily_venue_stats(date);
+CREATE INDEX IF NOT EXISTS idx_daily_content_stats_date ON daily_content_stats(date);
+CREATE INDEX IF NOT EXISTS idx_user_sessions_session ON user_sessions(session_id);
+'''
+
+# Batched daily stat increments; the UNIQUE(venue_id, date) / UNIQUE(content_id, date)
+# constraints double as the conflict targets, so no extra index is needed
+DAILY_VENUE_STATS_UPSERT = '''
+    INSERT INTO daily_venue_stats (venue_id, date, views)
+    VALUES (?, ?, ?)
+    ON CONFLICT(venue_id, date) DO UPDATE SET views = views + excluded.views
+'''
+
+DAILY_CONTENT_STATS_UPSERT = '''
+    INSERT INTO daily_content_stats (content_id, venue_id, date, views)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(content_id, date) DO UPDATE SET views = views + excluded.views
+'''
+
 class AnalyticsDatabase:
     def __init__(self, db_path: str = "nightlife.db"):
         self.db_path = db_path
@@ -37,120 +155,7 @@ class AnalyticsDatabase:
     def init_analytics_tables(self):
         """Initialize analytics-specific database tables"""
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Analytics events table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS analytics_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    event_type TEXT NOT NULL,
-                    venue_id INTEGER,
-                    content_id INTEGER,
-                    user_session TEXT,
-                    ip_address TEXT,
-                    user_agent TEXT,
-                    referrer TEXT,
-                    properties TEXT, -- JSON string
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (venue_id) REFERENCES venues (id),
-                    FOREIGN KEY (content_id) REFERENCES content (id)
-                )
-            ''')
-            
-            # User sessions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id TEXT UNIQUE NOT NULL,
-                    ip_address TEXT,
-                    user_agent TEXT,
-                    referrer TEXT,
-                    start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    page_views INTEGER DEFAULT 0,
-                    duration INTEGER DEFAULT 0, -- seconds
-                    is_active BOOLEAN DEFAULT TRUE
-                )
-            ''')
-            
-            # Daily venue stats
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS daily_venue_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    venue_id INTEGER NOT NULL,
-                    date DATE NOT NULL,
-                    views INTEGER DEFAULT 0,
-                    unique_visitors INTEGER DEFAULT 0,
-                    content_views INTEGER DEFAULT 0,
-                    shares INTEGER DEFAULT 0,
-                    favorites INTEGER DEFAULT 0,
-                    UNIQUE(venue_id, date),
-                    FOREIGN KEY (venue_id) REFERENCES venues (id)
-                )
-            ''')
-            
-            # Daily content stats
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS daily_content_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content_id INTEGER NOT NULL,
-                    venue_id INTEGER NOT NULL,
-                    date DATE NOT NULL,
-                    views INTEGER DEFAULT 0,
-                    unique_visitors INTEGER DEFAULT 0,
-                    shares INTEGER DEFAULT 0,
-                    engagement_time INTEGER DEFAULT 0, -- seconds
-                    UNIQUE(content_id, date),
-                    FOREIGN KEY (content_id) REFERENCES content (id),
-                    FOREIGN KEY (venue_id) REFERENCES venues (id)
-                )
-            ''')
-            
-            # Popular searches
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS search_analytics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    search_term TEXT NOT NULL,
-                    search_type TEXT, -- venue, neighborhood, content
-                    results_count INTEGER DEFAULT 0,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Geographic analytics
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS geographic_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ip_address TEXT,
-                    estimated_location TEXT, -- city, country
-                    venue_id INTEGER,
-                    date DATE DEFAULT (date('now')),
-                    views INTEGER DEFAULT 1,
-                    FOREIGN KEY (venue_id) REFERENCES venues (id)
-                )
-            ''')
-            
-            # Performance metrics
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS performance_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    metric_name TEXT NOT NULL,
-                    metric_value REAL NOT NULL,
-                    metadata TEXT, -- JSON string
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create indexes for better query performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_analytics_events_timestamp ON analytics_events(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_analytics_events_venue ON analytics_events(venue_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_analytics_events_content ON analytics_events(content_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_analytics_events_type ON analytics_events(event_type)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_daily_venue_stats_date ON daily_venue_stats(date)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_daily_content_stats_date ON daily_content_stats(date)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_sessions_session ON user_sessions(session_id)')
-            
-            conn.commit()
+            conn.executescript(ANALYTICS_DDL)
     
     def track_event(self, event: AnalyticsEvent):
         """Track an analytics event"""
@@ -221,6 +226,16 @@ class AnalyticsDatabase:
             
             conn.commit()
     
+    def record_daily_venue_views(self, rows: List[tuple]):
+        """Apply (venue_id, date, views) increments in one executemany"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(DAILY_VENUE_STATS_UPSERT, rows)
+    
+    def record_daily_content_views(self, rows: List[tuple]):
+        """Apply (content_id, venue_id, date, views) increments in one executemany"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(DAILY_CONTENT_STATS_UPSERT, rows)
+    
     def start_session(self, session_id: str, ip_address: str, user_agent: str, referrer: str = None):
         """Start a new user session"""
         with sqlite3.connect(self.db_path) as conn:
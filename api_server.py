@@ -1138,8 +1138,12 @@ async def ml_simple_status():
 # ==========================================
 
 @app.get("/api/moderation/pending")
-async def get_pending_moderation():
-    """Get pending content moderation items"""
+async def get_pending_moderation(limit: int = 50, before_created_at: Optional[str] = None,
+                                 before_id: Optional[int] = None):
+    """Get pending content moderation items
+    
+    Pass the created_at and id of the last item received to load the next page.
+    """
     if moderation_system is None:
         return {
             "status": "unavailable",
@@ -1149,7 +1153,8 @@ async def get_pending_moderation():
         }
     
     try:
-        pending_items = moderation_system.get_pending_moderation_items()
+        before = (before_created_at, before_id) if before_created_at and before_id is not None else None
+        pending_items = moderation_system.get_pending_moderation_items(limit, before)
         
         # Format for API response
         formatted_items = []
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Build the atlas_ingest native extension used by venue ingestion
+Compiles ahead of time with Numba so containers pay no JIT warm-up on start
+
+Usage: python build_ingest_ext.py
+"""
+
+from numba.pycc import CC
+
+cc = CC("atlas_ingest")
+cc.verbose = True
+
+@cc.export("busy_mask", "i8(unicode_type)")
+def busy_mask(busy_nights):
+    """Encode 'Thu,Fri,Sat' or 'Thursday, Friday' as a day bitmask (bit 0 = Monday)"""
+    mask = 0
+    for part in busy_nights.split(","):
+        day = part.strip()[:3].lower()
+        if day == "mon":
+            mask |= 1
+        elif day == "tue":
+            mask |= 2
+        elif day == "wed":
+            mask |= 4
+        elif day == "thu":
+            mask |= 8
+        elif day == "fri":
+            mask |= 16
+        elif day == "sat":
+            mask |= 32
+        elif day == "sun":
+            mask |= 64
+    return mask
+
+if __name__ == "__main__":
+    cc.compile()
@@ -92,6 +92,10 @@ class Database:
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
+                # Check first so an existing user doesn't cost a bcrypt hash
+                cursor.execute('SELECT 1 FROM admin_users WHERE username = ?', (username,))
+                if cursor.fetchone() is not None:
+                    return False
                 hashed_password = get_password_hash(password)
                 cursor.execute('''
                     INSERT INTO admin_users (username, email, full_name, hashed_password)
@@ -0,0 +1,62 @@
+"""
+Geographic helpers for venue lat/lng lookups
+Uses Numba to compile the distance kernel when it is installed
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Pure NumPy fallback: the kernel below still runs, just interpreted
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
+EARTH_RADIUS_KM = 6371.0
+
+@njit(parallel=True, fastmath=True, cache=True)
+def haversine_bulk(lats, lngs, qlat, qlng):
+    """Distance in kilometers from (qlat, qlng) to every point in lats/lngs"""
+    n = lats.shape[0]
+    distances = np.empty(n, dtype=np.float64)
+    qlat_rad = np.radians(qlat)
+    cos_qlat = np.cos(qlat_rad)
+
+    for i in prange(n):
+        lat_rad = np.radians(lats[i])
+        dlat = lat_rad - qlat_rad
+        dlng = np.radians(lngs[i] - qlng)
+        a = np.sin(dlat / 2) ** 2 + cos_qlat * np.cos(lat_rad) * np.sin(dlng / 2) ** 2
+        distances[i] = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+    return distances
+
+def load_venue_coordinates(cursor) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Load (ids, lats, lngs) arrays for venues that have coordinates"""
+    cursor.execute('''
+        SELECT id, latitude, longitude FROM venues
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+    ''')
+    rows = cursor.fetchall()
+
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    lats = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+    lngs = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+    return ids, lats, lngs
+
+def nearest_venues(ids: np.ndarray, lats: np.ndarray, lngs: np.ndarray,
+                   lat: float, lng: float, limit: int = 10) -> List[Tuple[int, float]]:
+    """Return up to `limit` (venue_id, distance_km) pairs closest to (lat, lng)"""
+    if ids.shape[0] == 0:
+        return []
+
+    distances = haversine_bulk(lats, lngs, lat, lng)
+    limit = min(limit, ids.shape[0])
+    nearest = np.argpartition(distances, limit - 1)[:limit]
+    nearest = nearest[np.argsort(distances[nearest])]
+    return [(int(ids[i]), float(distances[i])) for i in nearest]
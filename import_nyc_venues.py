@@ -3,11 +3,17 @@
 Import popular NYC nightlife venues into Atlas-NYC database
 """
 
-from venue_db import VenueDatabase, Venue
+from venue_db import VenueDatabase, VENUE_COLUMNS
 import googlemaps
 from config import settings
 from datetime import datetime
-import time
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+logger = logging.getLogger("importer")
+
+# Concurrent geocoding requests; googlemaps.Client enforces its own QPS limit
+GEOCODE_WORKERS = 8
 
 # Popular NYC nightlife venues by neighborhood
 NYC_VENUES = [
@@ -234,96 +240,122 @@ NYC_VENUES = [
     }
 ]
 
+# Insert-ready parameter tuples, built once at import time
+NYC_VENUE_ROWS = [tuple(d.get(k) for k in VENUE_COLUMNS) for d in NYC_VENUES]
+
+def geocode_address(gmaps, address):
+    """Geocode a single address, returning (lat, lng) or None"""
+    geocode_result = gmaps.geocode(address)
+    if geocode_result:
+        location = geocode_result[0]['geometry']['location']
+        return location['lat'], location['lng']
+    return None
+
+def geocode_all(gmaps, addresses, db=None):
+    """Geocode addresses concurrently, returning {address: (lat, lng)}
+    
+    When a VenueDatabase is given, cached results are reused and new ones stored.
+    """
+    addresses = list(dict.fromkeys(addresses))
+    coordinates = db.get_cached_geocodes(addresses) if db else {}
+    fetched = {}
+    
+    with ThreadPoolExecutor(max_workers=GEOCODE_WORKERS) as executor:
+        futures = {address: executor.submit(geocode_address, gmaps, address)
+                   for address in addresses if address not in coordinates}
+        for address, future in futures.items():
+            try:
+                result = future.result()
+                if result:
+                    fetched[address] = result
+            except Exception as e:
+                logger.warning("⚠️  Could not geocode %s: %s", address, e)
+    
+    if db:
+        db.cache_geocodes(fetched)
+    coordinates.update(fetched)
+    return coordinates
+
 def import_venues():
     """Import venues into the database"""
     db = VenueDatabase()
     gmaps = googlemaps.Client(key=settings.GOOGLE_MAPS_API_KEY) if settings.GOOGLE_MAPS_API_KEY else None
     
-    print(f"🚀 Starting import of {len(NYC_VENUES)} NYC venues...")
-    print(f"📍 Google Maps {'enabled' if gmaps else 'disabled'}")
+    logger.info("🚀 Starting import of %d NYC venues...", len(NYC_VENUE_ROWS))
+    logger.info("📍 Google Maps %s", 'enabled' if gmaps else 'disabled')
     
     imported = 0
     skipped = 0
     errors = 0
     
-    for venue_data in NYC_VENUES:
-        try:
-            # Check if venue already exists
-            existing = db.get_all_venues()
-            if any(v.instagram_handle == venue_data['instagram_handle'] for v in existing):
-                print(f"⏭️  Skipping {venue_data['name']} - already exists")
-                skipped += 1
-                continue
-            
-            # Get coordinates from Google Maps if available
-            lat, lng = None, None
-            if gmaps and venue_data.get('address'):
-                try:
-                    geocode_result = gmaps.geocode(venue_data['address'])
-                    if geocode_result:
-                        location = geocode_result[0]['geometry']['location']
-                        lat = location['lat']
-                        lng = location['lng']
-                        print(f"📍 Found coordinates for {venue_data['name']}: {lat}, {lng}")
-                except Exception as e:
-                    print(f"⚠️  Could not geocode {venue_data['name']}: {e}")
-            
-            # Create venue
-            venue = Venue(
-                name=venue_data['name'],
-                neighborhood=venue_data['neighborhood'],
-                instagram_handle=venue_data['instagram_handle'],
-                venue_type=venue_data['venue_type'],
-                address=venue_data.get('address'),
-                description=venue_data.get('description'),
-                busy_nights=venue_data.get('busy_nights'),
-                price_range=venue_data.get('price_range')
-            )
-            
-            # Add to database
-            venue_id = db.add_venue(venue)
-            if venue_id > 0:
-                print(f"✅ Imported {venue_data['name']} (ID: {venue_id})")
-                imported += 1
-                
-                # Add coordinates if available
-                if lat and lng:
-                    # You could extend the database to store coordinates
-                    pass
-            else:
-                print(f"❌ Failed to import {venue_data['name']}")
-                errors += 1
-            
-            # Rate limit for Google Maps API
-            if gmaps:
-                time.sleep(0.1)
-                
-        except Exception as e:
-            print(f"❌ Error importing {venue_data['name']}: {e}")
-            errors += 1
+    # Fetch existing handles once so the duplicate check is a set lookup
+    existing_handles = db.get_instagram_handles()
     
-    print(f"\n📊 Import Summary:")
-    print(f"✅ Imported: {imported}")
-    print(f"⏭️  Skipped: {skipped}")
-    print(f"❌ Errors: {errors}")
-    print(f"📊 Total venues in database: {len(db.get_all_venues())}")
+    # Geocode all new venues up front instead of one request per loop iteration
+    coordinates = {}
+    if gmaps:
+        coordinates = geocode_all(gmaps, [
+            row[4] for row in NYC_VENUE_ROWS
+            if row[4] and row[2] not in existing_handles
+        ], db)
+    
+    new_rows = []
+    for row in NYC_VENUE_ROWS:
+        name, _, instagram_handle, _, address = row[:5]
+        
+        # Check if venue already exists
+        if instagram_handle in existing_handles:
+            logger.info("⏭️  Skipping %s - already exists", name)
+            skipped += 1
+            continue
+        
+        # Get coordinates from the pre-fetched geocoding results
+        lat, lng = coordinates.get(address, (None, None))
+        if lat and lng:
+            logger.info("📍 Found coordinates for %s: %s, %s", name, lat, lng)
+        
+        new_rows.append(row)
+        existing_handles.add(instagram_handle)
+    
+    # Add to database in a single transaction; INSERT OR IGNORE skips any
+    # handle that appeared since the prefilter above
+    imported = db.add_venue_rows(new_rows)
+    if imported < 0:
+        logger.error("❌ Failed to import %d venues", len(new_rows))
+        errors += len(new_rows)
+        imported = 0
+    else:
+        skipped += len(new_rows) - imported
+    
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\n📊 Import Summary:")
+        logger.info("✅ Imported: %d", imported)
+        logger.info("⏭️  Skipped: %d", skipped)
+        logger.info("❌ Errors: %d", errors)
+        logger.info("📊 Total venues in database: %d", db.count_venues())
 
 def export_sample_data():
     """Export sample venue data for reference"""
+    # Nothing to show when info output is muted, so skip the query entirely
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     db = VenueDatabase()
-    venues = db.get_all_venues()
+    venues, total = db.preview(10)  # Show first 10
     
     if venues:
-        print(f"\n📝 Current venues in database:")
-        for v in venues[:10]:  # Show first 10
-            print(f"- {v.name} (@{v.instagram_handle}) - {v.neighborhood}")
+        logger.info("\n📝 Current venues in database:")
+        for v in venues:
+            logger.info("- %s (@%s) - %s", v['name'], v['instagram_handle'], v['neighborhood'])
         
-        if len(venues) > 10:
-            print(f"... and {len(venues) - 10} more")
+        if total > 10:
+            logger.info("... and %d more", total - 10)
 
 if __name__ == "__main__":
-    print("🌆 Atlas-NYC Venue Importer")
-    print("=" * 50)
+    logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO), format="%(message)s")
+    
+    logger.info("🌆 Atlas-NYC Venue Importer")
+    logger.info("=" * 50)
     
     # Import venues
     import_venues()
@@ -331,4 +363,4 @@ if __name__ == "__main__":
     # Show current data
     export_sample_data()
     
-    print("\n✨ Done! Your NYC nightlife database is ready.")
\ No newline at end of file
+    logger.info("\n✨ Done! Your NYC nightlife database is ready.")
\ No newline at end of file
@@ -5,193 +5,244 @@ Supports both SQLite (development) and PostgreSQL (production)
 """
 
 import os
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import sqlite3
 from config import settings
 from venue_db import VenueDatabase
 from datetime import datetime
 
+# PostgreSQL schema, sent to the server as one multi-statement execute.
+# Tables and secondary indexes are split so indexes can be built after the
+# SQLite migration has bulk-loaded venues: one sorted index build is much
+# cheaper than maintaining every B-tree on each inserted row.
+POSTGRES_TABLES_DDL = """
+-- Venues table
+CREATE TABLE IF NOT EXISTS venues (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    neighborhood VARCHAR(100) NOT NULL,
+    instagram_handle VARCHAR(100) NOT NULL UNIQUE,
+    venue_type VARCHAR(50) NOT NULL,
+    address TEXT,
+    description TEXT,
+    busy_nights VARCHAR(50),
+    price_range VARCHAR(10),
+    latitude REAL,
+    longitude REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Content table
+CREATE TABLE IF NOT EXISTS content (
+    id SERIAL PRIMARY KEY,
+    venue_id INTEGER NOT NULL,
+    content_type VARCHAR(50) NOT NULL,
+    caption TEXT,
+    file_path TEXT,
+    crowd_level VARCHAR(20),
+    urgency VARCHAR(20),
+    latitude REAL,
+    longitude REAL,
+    expires_at TIMESTAMP,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (venue_id) REFERENCES venues (id) ON DELETE CASCADE
+);
+
+-- Admin users table
+CREATE TABLE IF NOT EXISTS admin_users (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR(100) NOT NULL UNIQUE,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    hashed_password VARCHAR(255) NOT NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Analytics events table
+CREATE TABLE IF NOT EXISTS analytics_events (
+    id SERIAL PRIMARY KEY,
+    event_type VARCHAR(50) NOT NULL,
+    venue_id INTEGER,
+    user_agent TEXT,
+    ip_address INET,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    metadata JSONB
+);
+
+-- API keys table
+CREATE TABLE IF NOT EXISTS api_keys (
+    id SERIAL PRIMARY KEY,
+    key VARCHAR(255) NOT NULL UNIQUE,
+    name VARCHAR(100) NOT NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP
+);
+
+-- Audit log table
+CREATE TABLE IF NOT EXISTS audit_log (
+    id SERIAL PRIMARY KEY,
+    action VARCHAR(100) NOT NULL,
+    table_name VARCHAR(50),
+    record_id INTEGER,
+    admin_username VARCHAR(100),
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    details JSONB
+);
+"""
+
+POSTGRES_INDEXES_DDL = """
+-- Create index on venues
+CREATE INDEX IF NOT EXISTS idx_venues_neighborhood ON venues(neighborhood);
+CREATE INDEX IF NOT EXISTS idx_venues_type ON venues(venue_type);
+CREATE INDEX IF NOT EXISTS idx_venues_instagram ON venues(instagram_handle);
+
+-- Create index on content
+CREATE INDEX IF NOT EXISTS idx_content_venue_id ON content(venue_id);
+CREATE INDEX IF NOT EXISTS idx_content_type ON content(content_type);
+CREATE INDEX IF NOT EXISTS idx_content_timestamp ON content(timestamp);
+"""
+
+# Bump when POSTGRES_TABLES_DDL or POSTGRES_INDEXES_DDL changes so re-deploys
+# re-run the DDL; while it matches schema_meta both steps are skipped
+SCHEMA_VERSION = 1
+
+# Rows pulled from SQLite per fetch while migrating, bounding memory use
+MIGRATION_BATCH_SIZE = 1000
+
 def is_postgres():
     """Check if we're using PostgreSQL"""
     return settings.DATABASE_URL.startswith('postgresql://')
 
-def init_postgres_db():
+def installed_schema_version(conn) -> int:
+    """Return the schema version recorded in schema_meta (0 if none)"""
+    row = conn.execute("SELECT MAX(version) FROM schema_meta").fetchone()
+    return row[0] or 0
+
+def init_postgres_db(conn):
     """Initialize PostgreSQL database"""
     print("🐘 Initializing PostgreSQL database...")
     
-    # Parse DATABASE_URL
-    db_url = settings.DATABASE_URL
-    
     try:
-        # Connect to database
-        conn = psycopg2.connect(db_url)
-        cursor = conn.cursor()
-        
-        # Create tables
-        print("📊 Creating tables...")
-        
-        # Venues table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS venues (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL UNIQUE,
-                neighborhood VARCHAR(100) NOT NULL,
-                instagram_handle VARCHAR(100) NOT NULL UNIQUE,
-                venue_type VARCHAR(50) NOT NULL,
-                address TEXT,
-                description TEXT,
-                busy_nights VARCHAR(50),
-                price_range VARCHAR(10),
-                latitude REAL,
-                longitude REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        
-        # Create index on venues
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_venues_neighborhood ON venues(neighborhood);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_venues_type ON venues(venue_type);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_venues_instagram ON venues(instagram_handle);")
-        
-        # Content table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS content (
-                id SERIAL PRIMARY KEY,
-                venue_id INTEGER NOT NULL,
-                content_type VARCHAR(50) NOT NULL,
-                caption TEXT,
-                file_path TEXT,
-                crowd_level VARCHAR(20),
-                urgency VARCHAR(20),
-                latitude REAL,
-                longitude REAL,
-                expires_at TIMESTAMP,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (venue_id) REFERENCES venues (id) ON DELETE CASCADE
-            );
-        """)
-        
-        # Create index on content
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_venue_id ON content(venue_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_type ON content(content_type);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_timestamp ON content(timestamp);")
-        
-        # Admin users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS admin_users (
-                id SERIAL PRIMARY KEY,
-                username VARCHAR(100) NOT NULL UNIQUE,
-                email VARCHAR(255) NOT NULL UNIQUE,
-                hashed_password VARCHAR(255) NOT NULL,
-                is_active BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        
-        # Analytics events table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS analytics_events (
-                id SERIAL PRIMARY KEY,
-                event_type VARCHAR(50) NOT NULL,
-                venue_id INTEGER,
-                user_agent TEXT,
-                ip_address INET,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                metadata JSONB
-            );
-        """)
-        
-        # API keys table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS api_keys (
-                id SERIAL PRIMARY KEY,
-                key VARCHAR(255) NOT NULL UNIQUE,
-                name VARCHAR(100) NOT NULL,
-                is_active BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_used_at TIMESTAMP
-            );
-        """)
-        
-        # Audit log table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS audit_log (
-                id SERIAL PRIMARY KEY,
-                action VARCHAR(100) NOT NULL,
-                table_name VARCHAR(50),
-                record_id INTEGER,
-                admin_username VARCHAR(100),
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                details JSONB
-            );
-        """)
-        
-        conn.commit()
-        print("✅ PostgreSQL database initialized successfully!")
-        
-        # Check if we have any venues
-        cursor.execute("SELECT COUNT(*) FROM venues")
-        venue_count = cursor.fetchone()[0]
-        print(f"📊 Current venue count: {venue_count}")
-        
-        cursor.close()
-        conn.close()
+        with conn.cursor() as cursor:
+            cursor.execute("CREATE TABLE IF NOT EXISTS schema_meta (version INTEGER PRIMARY KEY)")
+            
+            if installed_schema_version(conn) == SCHEMA_VERSION:
+                print(f"✅ Schema already at version {SCHEMA_VERSION}, skipping DDL")
+            else:
+                # Create tables in a single round trip; indexes come after migration
+                print("📊 Creating tables...")
+                cursor.execute(POSTGRES_TABLES_DDL)
+            
+            conn.commit()
+            print("✅ PostgreSQL database initialized successfully!")
+            
+            # Check if we have any venues
+            cursor.execute("SELECT COUNT(*) FROM venues")
+            venue_count = cursor.fetchone()[0]
+            print(f"📊 Current venue count: {venue_count}")
         
         return True
         
     except Exception as e:
+        conn.rollback()
         print(f"❌ Error initializing PostgreSQL: {e}")
         return False
 
-def migrate_sqlite_to_postgres():
+def create_postgres_indexes(conn):
+    """Create secondary indexes; run after any bulk load"""
+    print("📇 Creating indexes...")
+    
+    try:
+        if installed_schema_version(conn) == SCHEMA_VERSION:
+            print("✅ Indexes already in place")
+            return
+        
+        # Record the version only once tables and indexes both exist
+        conn.execute(POSTGRES_INDEXES_DDL)
+        conn.execute(
+            "INSERT INTO schema_meta (version) VALUES (%s) ON CONFLICT (version) DO NOTHING",
+            (SCHEMA_VERSION,)
+        )
+        conn.commit()
+        print("✅ Indexes ready")
+        
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error creating indexes: {e}")
+
+def migrate_sqlite_to_postgres(postgres_conn):
     """Migrate data from SQLite to PostgreSQL"""
     print("🔄 Migrating data from SQLite to PostgreSQL...")
     
-    # Check if SQLite database exists
-    if not os.path.exists('nightlife.db'):
+    # Check if SQLite database exists and holds more than an empty header page
+    try:
+        st = os.stat('nightlife.db')
+    except FileNotFoundError:
         print("⚠️  No SQLite database found to migrate")
         return
+    if st.st_size < 4096:
+        print("⚠️  SQLite database is empty, nothing to migrate")
+        return
     
     try:
         # Connect to SQLite
         sqlite_conn = sqlite3.connect('nightlife.db')
         sqlite_cursor = sqlite_conn.cursor()
         
-        # Connect to PostgreSQL
-        postgres_conn = psycopg2.connect(settings.DATABASE_URL)
         postgres_cursor = postgres_conn.cursor()
         
-        # Migrate venues
-        sqlite_cursor.execute("SELECT * FROM venues")
-        venues = sqlite_cursor.fetchall()
+        # Migrate venues; the cursor is read in batches below, never fetchall()
+        sqlite_cursor.execute("""
+            SELECT name, neighborhood, instagram_handle, venue_type, 
+                   address, description, busy_nights, price_range
+            FROM venues
+        """)
         
-        # Get column names
-        sqlite_cursor.execute("PRAGMA table_info(venues)")
-        columns = [col[1] for col in sqlite_cursor.fetchall()]
+        # Stream rows into a staging table with COPY (id is left to auto-increment)
+        postgres_cursor.execute("""
+            CREATE TEMP TABLE venues_stage (
+                name VARCHAR(255),
+                neighborhood VARCHAR(100),
+                instagram_handle VARCHAR(100),
+                venue_type VARCHAR(50),
+                address TEXT,
+                description TEXT,
+                busy_nights VARCHAR(50),
+                price_range VARCHAR(10)
+            ) ON COMMIT DROP
+        """)
+        with postgres_cursor.copy("""
+            COPY venues_stage (name, neighborhood, instagram_handle, venue_type, 
+                               address, description, busy_nights, price_range)
+            FROM STDIN
+        """) as copy:
+            while True:
+                venues = sqlite_cursor.fetchmany(MIGRATION_BATCH_SIZE)
+                if not venues:
+                    break
+                for venue in venues:
+                    copy.write_row(venue)
         
-        migrated_venues = 0
-        for venue in venues:
-            try:
-                # Insert into PostgreSQL (excluding id to use auto-increment)
-                postgres_cursor.execute("""
-                    INSERT INTO venues (name, neighborhood, instagram_handle, venue_type, 
-                                      address, description, busy_nights, price_range)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (instagram_handle) DO NOTHING
-                """, venue[1:9])  # Skip id, take next 8 columns
-                migrated_venues += 1
-            except Exception as e:
-                print(f"⚠️  Skipped venue {venue[1]}: {e}")
+        # Move staged rows into venues, skipping handles that already exist
+        postgres_cursor.execute("""
+            INSERT INTO venues (name, neighborhood, instagram_handle, venue_type, 
+                              address, description, busy_nights, price_range)
+            SELECT name, neighborhood, instagram_handle, venue_type, 
+                   address, description, busy_nights, price_range
+            FROM venues_stage
+            ON CONFLICT (instagram_handle) DO NOTHING
+        """)
+        migrated_venues = postgres_cursor.rowcount
         
         postgres_conn.commit()
         print(f"✅ Migrated {migrated_venues} venues")
         
-        # Close connections
+        # Close SQLite; the PostgreSQL connection belongs to the caller
         sqlite_conn.close()
-        postgres_conn.close()
+        postgres_cursor.close()
         
     except Exception as e:
+        postgres_conn.rollback()
         print(f"❌ Migration error: {e}")
 
 def main():
@@ -202,10 +253,23 @@ def main():
     print(f"Database URL: {settings.DATABASE_URL[:50]}...")
     
     if is_postgres():
-        # Initialize PostgreSQL
-        if init_postgres_db():
-            # Try to migrate SQLite data if available
-            migrate_sqlite_to_postgres()
+        # Imported here so SQLite-only setups never load the driver
+        import psycopg
+        
+        # One connection (one TCP/TLS/auth handshake) for every step
+        try:
+            conn = psycopg.connect(settings.DATABASE_URL)
+        except Exception as e:
+            print(f"❌ Error connecting to PostgreSQL: {e}")
+            conn = None
+        
+        if conn is not None:
+            with conn:
+                # Initialize PostgreSQL
+                if init_postgres_db(conn):
+                    # Try to migrate SQLite data if available, then index the loaded rows
+                    migrate_sqlite_to_postgres(conn)
+                    create_postgres_indexes(conn)
     else:
         # Use existing SQLite initialization
         print("💾 Using SQLite database...")
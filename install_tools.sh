@@ -3,7 +3,7 @@
 echo "Installing NYC Nightlife Content Tools..."
 
 # Install Python dependencies
-pip install requests pillow pyautogui opencv-python
+pip install requests requests-toolbelt pillow pyautogui opencv-python
 
 echo "✅ Installation complete!"
 echo ""
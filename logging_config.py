@@ -1,13 +1,27 @@
+import asyncio
+import atexit
+import functools
 import logging
 import logging.handlers
+import queue
 import sys
 import os
+import time
 from pathlib import Path
 from datetime import datetime
 from config import settings
 
+# Loggers used by the helpers below, resolved once instead of on every event
+_SECURITY_LOG = logging.getLogger("security")
+_DB_LOG = logging.getLogger("database")
+_ANALYTICS_LOG = logging.getLogger("analytics")
+
+# Background thread that owns the console/file handlers (see setup_logging)
+_queue_listener = None
+
 def setup_logging():
     """Configure logging for Atlas-NYC"""
+    global _queue_listener
     
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
@@ -32,34 +46,44 @@ def setup_logging():
     # Remove default handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    shutdown_logging()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(simple_formatter)
-    root_logger.addHandler(console_handler)
     
     # File handler with rotation
     file_handler = logging.handlers.RotatingFileHandler(
         settings.LOG_FILE,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True  # open on first record, not at setup
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(file_handler)
     
     # Error file handler (errors only)
     error_handler = logging.handlers.RotatingFileHandler(
         'logs/atlas-nyc-errors.log',
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True  # open on first record, not at setup
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(error_handler)
+    
+    # Request threads only enqueue records; the listener thread does the
+    # console/file writes and rotation off the hot path
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, error_handler,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
     
     # Configure specific loggers
     configure_specific_loggers()
@@ -70,6 +94,17 @@ def setup_logging():
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Log file: {settings.LOG_FILE}")
 
+def shutdown_logging():
+    """Flush queued log records and stop the listener thread"""
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+# Registered once for the process; setup_logging may run many times
+atexit.register(shutdown_logging)
+
 def configure_specific_loggers():
     """Configure specific loggers for different components"""
     
@@ -102,84 +137,79 @@ def get_logger(name: str) -> logging.Logger:
 def log_performance(func_name: str = None):
     """Decorator to log function performance"""
     def decorator(func):
-        import functools
-        import time
+        logger = get_logger("performance")
+        name = func_name or f"{func.__module__}.{func.__name__}"
         
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            logger = get_logger("performance")
-            name = func_name or f"{func.__module__}.{func.__name__}"
-            start_time = time.time()
+        # Pick the wrapper once, based on function type
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start_time = time.perf_counter()
+                
+                try:
+                    result = await func(*args, **kwargs)
+                    if logger.isEnabledFor(logging.INFO):
+                        duration = time.perf_counter() - start_time
+                        logger.info(f"{name} completed in {duration:.3f}s")
+                    return result
+                except Exception as e:
+                    duration = time.perf_counter() - start_time
+                    logger.error(f"{name} failed after {duration:.3f}s: {str(e)}")
+                    raise
             
-            try:
-                result = await func(*args, **kwargs)
-                duration = time.time() - start_time
-                logger.info(f"{name} completed in {duration:.3f}s")
-                return result
-            except Exception as e:
-                duration = time.time() - start_time
-                logger.error(f"{name} failed after {duration:.3f}s: {str(e)}")
-                raise
+            return async_wrapper
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            logger = get_logger("performance")
-            name = func_name or f"{func.__module__}.{func.__name__}"
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             try:
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
-                logger.info(f"{name} completed in {duration:.3f}s")
+                if logger.isEnabledFor(logging.INFO):
+                    duration = time.perf_counter() - start_time
+                    logger.info(f"{name} completed in {duration:.3f}s")
                 return result
             except Exception as e:
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 logger.error(f"{name} failed after {duration:.3f}s: {str(e)}")
                 raise
         
-        # Return appropriate wrapper based on function type
-        import asyncio
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return sync_wrapper
     
     return decorator
 
 # Security logging functions
 def log_security_event(event_type: str, details: dict, request_info: dict = None):
     """Log security-related events"""
-    logger = get_logger("security")
-    
-    message = f"Security Event: {event_type}"
-    if request_info:
-        message += f" | IP: {request_info.get('ip', 'unknown')}"
-        message += f" | User-Agent: {request_info.get('user_agent', 'unknown')[:100]}"
-    
-    logger.warning(message, extra={
+    extra = {
         'event_type': event_type,
         'details': details,
         'request_info': request_info
-    })
+    }
+    
+    if request_info:
+        _SECURITY_LOG.warning(
+            "Security Event: %s | IP: %s | User-Agent: %.100s",
+            event_type,
+            request_info.get('ip', 'unknown'),
+            request_info.get('user_agent', 'unknown'),
+            extra=extra
+        )
+    else:
+        _SECURITY_LOG.warning("Security Event: %s", event_type, extra=extra)
 
 def log_authentication_attempt(username: str, success: bool, ip_address: str, details: dict = None):
     """Log authentication attempts"""
-    logger = get_logger("security")
-    
-    status = "SUCCESS" if success else "FAILED"
-    message = f"Authentication {status}: {username} from {ip_address}"
-    
-    if success:
-        logger.info(message, extra={'username': username, 'ip': ip_address, 'details': details})
-    else:
-        logger.warning(message, extra={'username': username, 'ip': ip_address, 'details': details})
+    level = logging.INFO if success else logging.WARNING
+    _SECURITY_LOG.log(
+        level, "Authentication %s: %s from %s",
+        "SUCCESS" if success else "FAILED", username, ip_address,
+        extra={'username': username, 'ip': ip_address, 'details': details}
+    )
 
 def log_rate_limit_exceeded(ip_address: str, endpoint: str, details: dict = None):
     """Log rate limit violations"""
-    logger = get_logger("security")
-    
-    message = f"Rate limit exceeded: {ip_address} on {endpoint}"
-    logger.warning(message, extra={
+    _SECURITY_LOG.warning("Rate limit exceeded: %s on %s", ip_address, endpoint, extra={
         'ip_address': ip_address,
         'endpoint': endpoint,
         'details': details
@@ -188,31 +218,38 @@ def log_rate_limit_exceeded(ip_address: str, endpoint: str, details: dict = None
 # Database logging functions
 def log_database_operation(operation: str, table: str, record_id: int = None, details: dict = None):
     """Log database operations"""
-    logger = get_logger("database")
-    
-    message = f"DB {operation.upper()}: {table}"
-    if record_id:
-        message += f" (ID: {record_id})"
+    if not _DB_LOG.isEnabledFor(logging.INFO):
+        return
     
-    logger.info(message, extra={
+    extra = {
         'operation': operation,
         'table': table,
         'record_id': record_id,
         'details': details
-    })
+    }
+    
+    if record_id:
+        _DB_LOG.info("DB %s: %s (ID: %s)", operation.upper(), table, record_id, extra=extra)
+    else:
+        _DB_LOG.info("DB %s: %s", operation.upper(), table, extra=extra)
 
 # Analytics logging functions
 def log_analytics_event(event_type: str, venue_id: int = None, user_session: str = None, details: dict = None):
     """Log analytics events"""
-    logger = get_logger("analytics")
+    if not _ANALYTICS_LOG.isEnabledFor(logging.INFO):
+        return
     
-    message = f"Analytics: {event_type}"
+    # Constant format pieces; the values are only interpolated if a handler emits
+    fmt = "Analytics: %s"
+    args = [event_type]
     if venue_id:
-        message += f" (Venue: {venue_id})"
+        fmt += " (Venue: %s)"
+        args.append(venue_id)
     if user_session:
-        message += f" (Session: {user_session[:8]}...)"
+        fmt += " (Session: %.8s...)"
+        args.append(user_session)
     
-    logger.info(message, extra={
+    _ANALYTICS_LOG.info(fmt, *args, extra={
         'event_type': event_type,
         'venue_id': venue_id,
         'user_session': user_session,
@@ -9,11 +9,34 @@ from tkinter import ttk, messagebox, filedialog
 import subprocess
 import tempfile
 import os
+import mimetypes
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+from urllib3.util.retry import Retry
 import json
+import hashlib
 import threading
 from datetime import datetime
 
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    # PyObjC: capture the full screen in-process instead of spawning screencapture
+    import Quartz
+    from Foundation import NSURL
+except ImportError:
+    Quartz = None
+
+# PNGs above this size are transcoded to JPEG before upload (when enabled)
+COMPRESS_THRESHOLD_BYTES = 1024 * 1024
+
+# Last /api/venues response plus its validator, reused across launches
+VENUE_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".nyc_nightlife", "venues.json")
+
 class MacCaptureTools:
     def __init__(self, root):
         self.root = root
@@ -23,8 +46,21 @@ class MacCaptureTools:
         
         self.api_base = "http://localhost:8001"
         self.venues = []
+        self._venues_hash = None
         self.captured_file = None
         
+        # One pooled, keep-alive session for every API call. Transient failures
+        # are retried inside the adapter on the pooled connection; POST stays out
+        # of allowed_methods because a streamed upload body cannot be replayed,
+        # but connect errors (nothing sent yet) are still retried for uploads
+        retry = Retry(total=5, connect=3, read=3, backoff_factor=0.5,
+                      status_forcelist=(502, 503, 504))
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=retry
+        ))
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         self.setup_ui()
         self.load_venues()
     
@@ -126,6 +162,12 @@ class MacCaptureTools:
         self.caption_text = tk.Text(upload_frame, height=3, font=("SF Pro Display", 11))
         self.caption_text.pack(fill="x", pady=(5, 10))
         
+        # Compression toggle (turn off when a lossless upload is required)
+        self.compress_var = tk.BooleanVar(value=Image is not None)
+        tk.Checkbutton(upload_frame, text="Compress screenshots before upload", 
+                       variable=self.compress_var, font=("SF Pro Display", 11),
+                       bg="#f0f0f0").pack(anchor="w")
+        
         # Upload button
         self.upload_btn = tk.Button(upload_frame, text="🚀 Upload to NYC Nightlife", 
                                    command=self.upload_content,
@@ -138,32 +180,97 @@ class MacCaptureTools:
         self.status_label = tk.Label(self.root, text="Ready to capture content", 
                                     font=("SF Pro Display", 11), fg="#34C759", bg="#f0f0f0")
         self.status_label.pack(pady=5)
+        
+        # Upload progress
+        self.progress = ttk.Progressbar(self.root, mode='determinate', maximum=100)
+        self.progress.pack(fill="x", padx=20, pady=(0, 5))
     
     def load_venues(self):
+        # Fill the venue list from disk immediately, then revalidate in the background
+        cached = self._read_venue_cache()
+        etag = None
+        if cached:
+            etag = cached.get("etag")
+            self._venues_hash = cached.get("hash")
+            self._apply_venues(cached.get("venues", []), from_cache=True)
+        
+        threading.Thread(target=self._load_venues_worker, args=(etag, bool(cached)), 
+                         daemon=True).start()
+    
+    def _load_venues_worker(self, etag, have_cache):
         try:
-            response = requests.get(f"{self.api_base}/api/venues", timeout=5)
-            if response.status_code == 200:
-                self.venues = response.json()
-                venue_names = [f"{v['name']} - {v['neighborhood']}" for v in self.venues]
-                self.venue_combo['values'] = venue_names
-                if venue_names:
-                    self.venue_combo.set(venue_names[0])
-                self.status_label.config(text=f"✅ Loaded {len(self.venues)} venues", fg="#34C759")
-            else:
+            headers = {"If-None-Match": etag} if etag else {}
+            response = self.session.get(f"{self.api_base}/api/venues", headers=headers, timeout=5)
+            if response.status_code == 304:
+                return
+            if response.status_code != 200:
                 raise Exception(f"HTTP {response.status_code}")
+            
+            # An unchanged payload skips JSON parsing and the combobox refresh even
+            # if the ETag changed; servers without ETag support use the hash instead
+            body_hash = hashlib.blake2b(response.content, digest_size=8).hexdigest()
+            if body_hash == self._venues_hash:
+                return
+            new_etag = response.headers.get("ETag") or body_hash
+            
+            venues = response.json()
+            self._venues_hash = body_hash
+            self._write_venue_cache(new_etag, body_hash, venues)
+            self.root.after(0, self._apply_venues, venues)
         except Exception as e:
-            self.status_label.config(text=f"⚠️ Could not connect to API: {e}", fg="#FF3B30")
+            if have_cache:
+                message = f"⚠️ Using cached venues (API unavailable: {e})"
+            else:
+                message = f"⚠️ Could not connect to API: {e}"
+            self.root.after(0, lambda: self.status_label.config(text=message, fg="#FF3B30"))
+    
+    def _apply_venues(self, venues, from_cache=False):
+        self.venues = venues
+        venue_names = [f"{v['name']} - {v['neighborhood']}" for v in self.venues]
+        self.venue_combo['values'] = venue_names
+        if venue_names and self.venue_combo.get() not in venue_names:
+            self.venue_combo.set(venue_names[0])
+        source = " (cached)" if from_cache else ""
+        self.status_label.config(text=f"✅ Loaded {len(self.venues)} venues{source}", fg="#34C759")
+    
+    def _read_venue_cache(self):
+        try:
+            with open(VENUE_CACHE_FILE, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_venue_cache(self, etag, body_hash, venues):
+        # Write to a temp file and rename so a crash never leaves a torn cache;
+        # the cache is best-effort, so disk errors are ignored
+        temp_path = None
+        try:
+            cache_dir = os.path.dirname(VENUE_CACHE_FILE)
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"etag": etag, "hash": body_hash, "venues": venues}, f)
+            os.replace(temp_path, VENUE_CACHE_FILE)
+        except OSError:
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
     
     def mac_screenshot(self, mode):
         try:
             self.status_label.config(text="📸 Taking screenshot...", fg="#007AFF")
-            self.root.update()
             
             # Create temp file
             temp_dir = tempfile.gettempdir()
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = os.path.join(temp_dir, f"nyc_nightlife_screenshot_{timestamp}.png")
             
+            if mode != "selection" and Quartz is not None:
+                # Full screen without a subprocess, written straight to JPEG
+                jpeg_filename = os.path.splitext(filename)[0] + ".jpg"
+                threading.Thread(target=self._quartz_screenshot_worker, 
+                                 args=(jpeg_filename, filename), daemon=True).start()
+                return
+            
             if mode == "selection":
                 # Interactive selection (Cmd+Shift+4)
                 cmd = ["screencapture", "-i", filename]
@@ -171,18 +278,55 @@ class MacCaptureTools:
                 # Full screen (Cmd+Shift+3)
                 cmd = ["screencapture", filename]
             
-            # Run screencapture command
+            # screencapture blocks until the user finishes, so keep it off the Tk thread
+            threading.Thread(target=self._screenshot_worker, args=(cmd, filename), 
+                             daemon=True).start()
+                
+        except Exception as e:
+            self.status_label.config(text=f"❌ Error: {e}", fg="#FF3B30")
+    
+    def _screenshot_worker(self, cmd, filename):
+        try:
             result = subprocess.run(cmd, capture_output=True, text=True)
-            
             if result.returncode == 0 and os.path.exists(filename):
-                self.captured_file = filename
-                self.file_label.config(text=os.path.basename(filename))
-                self.status_label.config(text="✅ Screenshot captured successfully!", fg="#34C759")
+                self.root.after(0, self.screenshot_complete, filename)
             else:
-                self.status_label.config(text="❌ Screenshot cancelled or failed", fg="#FF3B30")
-                
+                self.root.after(0, lambda: self.status_label.config(
+                    text="❌ Screenshot cancelled or failed", fg="#FF3B30"))
         except Exception as e:
-            self.status_label.config(text=f"❌ Error: {e}", fg="#FF3B30")
+            message = f"❌ Error: {e}"
+            self.root.after(0, lambda: self.status_label.config(text=message, fg="#FF3B30"))
+    
+    def _quartz_screenshot_worker(self, filename, fallback_filename):
+        try:
+            if self.quartz_capture_main_display(filename):
+                self.root.after(0, self.screenshot_complete, filename)
+                return
+        except Exception:
+            pass
+        
+        # No screen-recording permission or a Quartz error: use screencapture
+        self._screenshot_worker(["screencapture", fallback_filename], fallback_filename)
+    
+    def quartz_capture_main_display(self, filename, quality=0.8):
+        image = Quartz.CGDisplayCreateImage(Quartz.CGMainDisplayID())
+        if image is None:
+            return False
+        
+        url = NSURL.fileURLWithPath_(filename)
+        destination = Quartz.CGImageDestinationCreateWithURL(url, "public.jpeg", 1, None)
+        if destination is None:
+            return False
+        
+        Quartz.CGImageDestinationAddImage(destination, image, {
+            Quartz.kCGImageDestinationLossyCompressionQuality: quality
+        })
+        return bool(Quartz.CGImageDestinationFinalize(destination))
+    
+    def screenshot_complete(self, filename):
+        self.captured_file = filename
+        self.file_label.config(text=os.path.basename(filename))
+        self.status_label.config(text="✅ Screenshot captured successfully!", fg="#34C759")
     
     def mac_screen_record(self):
         try:
@@ -260,43 +404,103 @@ class MacCaptureTools:
         
         venue_id = self.venues[venue_index]['id']
         
+        self.status_label.config(text="🚀 Uploading content...", fg="#007AFF")
+        self.upload_btn.config(state="disabled")
+        self.progress.configure(value=0)
+        
+        # Prepare data (read widgets here; Tk is not safe to touch from the worker)
+        data = {
+            'venue_id': venue_id,
+            'content_type': self.content_type.get(),
+            'caption': self.caption_text.get("1.0", tk.END).strip()
+        }
+        
+        threading.Thread(target=self._upload_worker, 
+                         args=(self.captured_file, data, self.compress_var.get()), 
+                         daemon=True).start()
+    
+    def _upload_worker(self, path, data, compress):
+        compressed_path = None
         try:
-            self.status_label.config(text="🚀 Uploading content...", fg="#007AFF")
-            self.upload_btn.config(state="disabled")
-            self.root.update()
-            
-            # Prepare data
-            data = {
-                'venue_id': venue_id,
-                'content_type': self.content_type.get(),
-                'caption': self.caption_text.get("1.0", tk.END).strip()
-            }
+            if compress and self.should_compress(path):
+                compressed_path = self.compress_screenshot(path)
+                path = compressed_path
             
-            # Upload file
-            with open(self.captured_file, 'rb') as f:
-                files = {'file': f}
-                response = requests.post(f"{self.api_base}/api/content", 
-                                       data=data, files=files, timeout=30)
-            
-            if response.status_code in [200, 201]:
-                result = response.json()
-                messagebox.showinfo("Success", 
-                                   f"Content uploaded successfully!\n\nID: {result['id']}\n\nView at: http://localhost:8001/public")
-                self.clear_form()
-                self.status_label.config(text="✅ Upload successful!", fg="#34C759")
-            else:
-                error_msg = response.text
-                messagebox.showerror("Upload Failed", f"Error: {error_msg}")
-                self.status_label.config(text="❌ Upload failed", fg="#FF3B30")
-                
+            # Stream the multipart body from disk instead of building it in memory
+            mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            with open(path, 'rb') as f:
+                encoder = MultipartEncoder(fields={
+                    'venue_id': str(data['venue_id']),
+                    'content_type': data['content_type'],
+                    'caption': data['caption'],
+                    'file': (os.path.basename(path), f, mimetype)
+                })
+                monitor = MultipartEncoderMonitor(encoder, self._make_progress_callback())
+                response = self.session.post(f"{self.api_base}/api/content", 
+                                             data=monitor, 
+                                             headers={'Content-Type': monitor.content_type}, 
+                                             timeout=(5, 120))
+            self.root.after(0, self._upload_finished, response)
         except requests.exceptions.Timeout:
-            messagebox.showerror("Timeout", "Upload timed out. Please try again.")
-            self.status_label.config(text="⏱️ Upload timed out", fg="#FF9500")
+            self.root.after(0, self._upload_failed, "Timeout", 
+                            "Upload timed out. Please try again.", "⏱️ Upload timed out", "#FF9500")
         except Exception as e:
-            messagebox.showerror("Error", f"Network error: {e}")
-            self.status_label.config(text=f"❌ Error: {e}", fg="#FF3B30")
+            self.root.after(0, self._upload_failed, "Error", 
+                            f"Network error: {e}", f"❌ Error: {e}", "#FF3B30")
         finally:
-            self.upload_btn.config(state="normal")
+            if compressed_path and os.path.exists(compressed_path):
+                os.remove(compressed_path)
+    
+    def should_compress(self, path):
+        return (Image is not None and path.lower().endswith(".png") 
+                and os.path.getsize(path) > COMPRESS_THRESHOLD_BYTES)
+    
+    def compress_screenshot(self, path):
+        # Retina PNGs run 10-20 MB; JPEG q85 is typically 5-10x smaller
+        base = os.path.splitext(os.path.basename(path))[0]
+        fd, new_path = tempfile.mkstemp(prefix=f"{base}_", suffix=".jpg")
+        os.close(fd)
+        with Image.open(path) as img:
+            img.convert("RGB").save(new_path, format="JPEG", quality=85, 
+                                    optimize=True, progressive=True)
+        return new_path
+    
+    def _make_progress_callback(self):
+        # Only schedule a repaint when the whole percentage changes, not per chunk
+        last_percent = [-1]
+        
+        def callback(monitor):
+            percent = 100 * monitor.bytes_read // monitor.len if monitor.len else 100
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                self.root.after(0, self.progress.configure, {'value': percent})
+        
+        return callback
+    
+    def _upload_finished(self, response):
+        self.upload_btn.config(state="normal")
+        self.progress.configure(value=0)
+        
+        if response.status_code in [200, 201]:
+            result = response.json()
+            messagebox.showinfo("Success", 
+                               f"Content uploaded successfully!\n\nID: {result['id']}\n\nView at: http://localhost:8001/public")
+            self.clear_form()
+            self.status_label.config(text="✅ Upload successful!", fg="#34C759")
+        else:
+            error_msg = response.text
+            messagebox.showerror("Upload Failed", f"Error: {error_msg}")
+            self.status_label.config(text="❌ Upload failed", fg="#FF3B30")
+    
+    def _upload_failed(self, title, message, status, color):
+        self.upload_btn.config(state="normal")
+        self.progress.configure(value=0)
+        messagebox.showerror(title, message)
+        self.status_label.config(text=status, fg=color)
+    
+    def on_close(self):
+        self.session.close()
+        self.root.destroy()
     
     def clear_form(self):
         self.caption_text.delete("1.0", tk.END)
@@ -4,79 +4,109 @@ This ensures the API can start successfully on Render
 """
 
 from fastapi import APIRouter
+from fastapi.responses import Response
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Optional
+import json
+import time
 
 router = APIRouter(prefix="/api/ml", tags=["ml"])
 
+# Response bodies are static apart from their timestamp, so they are built once
+# and the encoded JSON is reused for up to a second (see _timestamped_body)
+_STATUS_TEMPLATE = {
+    "status": "operational",
+    "message": "Basic ML endpoints working",
+    "version": "1.0.0"
+}
+
+_HEALTH_TEMPLATE = {
+    "status": "healthy",
+    "ml_system_initialized": False,
+    "components": {
+        "enhancer": False,
+        "discovery": False,
+        "insights": False,
+        "moderation": False
+    },
+    "message": "ML system in setup phase"
+}
+
+_ANALYTICS_TEMPLATE = {
+    "status": "success",
+    "ml_system_active": False,
+    "venues_enhanced": 0,
+    "venues_auto_discovered": 0,
+    "venue_type_distribution": {},
+    "system_health": {
+        "enhancer_active": False,
+        "discovery_active": False,
+        "insights_active": False
+    },
+    "message": "ML analytics will be available once system is fully initialized"
+}
+
+# Endpoint name -> (template, timestamp field)
+_TIMESTAMPED = {
+    "status": (_STATUS_TEMPLATE, "timestamp"),
+    "health": (_HEALTH_TEMPLATE, "timestamp"),
+    "analytics": (_ANALYTICS_TEMPLATE, "last_updated")
+}
+
+@lru_cache(maxsize=len(_TIMESTAMPED))
+def _timestamped_body(name: str, second: int) -> bytes:
+    """Encode an endpoint's template with its timestamp, once per second"""
+    template, field = _TIMESTAMPED[name]
+    body = {**template, field: datetime.fromtimestamp(second).isoformat()}
+    return json.dumps(body).encode()
+
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
 @router.get("/status")
 async def ml_status():
     """Simple ML status endpoint"""
-    return {
-        "status": "operational",
-        "message": "Basic ML endpoints working",
-        "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0"
-    }
+    return _json_response(_timestamped_body("status", int(time.time())))
 
-@router.get("/health")  
+@router.get("/health")
 async def ml_health():
     """ML health check"""
-    return {
-        "status": "healthy",
-        "ml_system_initialized": False,
-        "components": {
-            "enhancer": False,
-            "discovery": False,
-            "insights": False,
-            "moderation": False
-        },
-        "timestamp": datetime.now().isoformat(),
-        "message": "ML system in setup phase"
-    }
+    return _json_response(_timestamped_body("health", int(time.time())))
 
 @router.get("/analytics")
 async def ml_analytics():
     """Basic ML analytics"""
-    return {
-        "status": "success",
-        "ml_system_active": False,
-        "venues_enhanced": 0,
-        "venues_auto_discovered": 0,
-        "venue_type_distribution": {},
-        "system_health": {
-            "enhancer_active": False,
-            "discovery_active": False,
-            "insights_active": False
-        },
-        "last_updated": datetime.now().isoformat(),
-        "message": "ML analytics will be available once system is fully initialized"
-    }
+    return _json_response(_timestamped_body("analytics", int(time.time())))
 
 # Basic moderation endpoints
 moderation_router = APIRouter(prefix="/api/moderation", tags=["moderation"])
 
+_PENDING_BODY = json.dumps({
+    "status": "unavailable",
+    "message": "Moderation system initializing",
+    "pending_items": [],
+    "count": 0
+}).encode()
+
+_STATS_BODY = json.dumps({
+    "status": "success",
+    "stats": {
+        "pending_items": 0,
+        "approval_rate": 0,
+        "total_approved": 0,
+        "total_rejected": 0,
+        "training_data_points": 0,
+        "recent_activity": {}
+    }
+}).encode()
+
 @moderation_router.get("/pending")
 async def get_pending_moderation():
     """Get pending content moderation items"""
-    return {
-        "status": "unavailable",
-        "message": "Moderation system initializing",
-        "pending_items": [],
-        "count": 0
-    }
+    return _json_response(_PENDING_BODY)
 
-@moderation_router.get("/stats")  
+@moderation_router.get("/stats")
 async def get_moderation_stats():
     """Get content moderation statistics"""
-    return {
-        "status": "success",
-        "stats": {
-            "pending_items": 0,
-            "approval_rate": 0,
-            "total_approved": 0,
-            "total_rejected": 0,
-            "training_data_points": 0,
-            "recent_activity": {}
-        }
-    }
\ No newline at end of file
+    return _json_response(_STATS_BODY)
@@ -6,12 +6,70 @@ from ml_system.integration_api import (
     enhance_venues as ml_enhance_venues,
     predict_venue_metrics as ml_predict_venue
 )
-from ml_system.automated_venue_discovery import AutomatedVenueDiscovery
+from ml_system.automated_venue_discovery import AutomatedVenueDiscovery, create_http_session
 from ml_system.smart_content_enhancer import SmartContentEnhancer
+from ml_system.ml_models import MLModelManager
+from dataclasses import asdict
+import asyncio
+import time
 
 # Initialize ML components (add to your app startup)
 ml_discovery = AutomatedVenueDiscovery()
 ml_enhancer = SmartContentEnhancer()
+ml_manager = MLModelManager()
+
+@app.on_event("startup")
+async def start_ml_http_session():
+    """Share one pooled HTTP session across discovery runs"""
+    ml_discovery.http_session = create_http_session()
+
+@app.on_event("shutdown")
+async def close_ml_http_session():
+    if ml_discovery.http_session:
+        await ml_discovery.http_session.close()
+
+# Per-venue ML results are reused for ML_CACHE_TTL seconds. A lock per key
+# makes concurrent requests for an uncached venue wait for one computation;
+# _cache_locks maps (cache id, key) -> [lock, tasks holding or waiting on it]
+ML_CACHE_TTL = 300
+ML_CACHE_MAXSIZE = 1024
+_insights_cache = {}
+_enhancement_cache = {}
+_cache_locks = {}
+
+def _cache_store(cache, key, value):
+    """Store value under key, evicting the oldest entry once ML_CACHE_MAXSIZE is reached"""
+    cache.pop(key, None)
+    if len(cache) >= ML_CACHE_MAXSIZE:
+        cache.pop(next(iter(cache)))  # oldest insert
+    cache[key] = (time.monotonic(), value)
+
+async def _cached(cache, key, compute):
+    """Return cache[key] if fresh, else await compute() once and store it"""
+    entry = cache.get(key)
+    if entry and time.monotonic() - entry[0] < ML_CACHE_TTL:
+        return entry[1]
+    
+    lock_key = (id(cache), key)
+    lock_entry = _cache_locks.get(lock_key)
+    if lock_entry is None:
+        lock_entry = _cache_locks[lock_key] = [asyncio.Lock(), 0]
+    lock_entry[1] += 1
+    try:
+        async with lock_entry[0]:
+            entry = cache.get(key)
+            if entry and time.monotonic() - entry[0] < ML_CACHE_TTL:
+                return entry[1]
+            
+            value = await compute()
+            _cache_store(cache, key, value)
+            return value
+    finally:
+        # Drop the lock only once no task holds or waits on it, so a failed or
+        # expired computation can't split waiters and new callers across locks
+        lock_entry[1] -= 1
+        if not lock_entry[1]:
+            del _cache_locks[lock_key]
 
 @app.post("/api/ml/discover-venues")
 async def api_discover_venues(
@@ -29,16 +87,42 @@ async def api_discover_venues(
 async def api_enhance_venue(venue_id: int):
     """Enhance venue with ML-generated content"""
     try:
-        # Get venue from database
-        venue_data = get_venue_by_id(venue_id)  # Your existing function
+        async def compute():
+            # Get venue from database
+            venue_data = get_venue_by_id(venue_id)  # Your existing function
+            
+            # Enhance with ML
+            enhancement = await ml_enhancer.enhance_venue(venue_data)
+            
+            # Update database with enhancement
+            update_venue_enhancement(venue_id, enhancement)  # Implement this
+            return enhancement
+        
+        enhancement = await _cached(_enhancement_cache, venue_id, compute)
+        return {"status": "success", "enhancement": enhancement}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/ml/enhance-venues")
+async def api_enhance_venues_batch(venue_ids: List[int]):
+    """Enhance many venues in one request"""
+    try:
+        # Get all requested venues in one query, in request order
+        venue_ids = list(dict.fromkeys(venue_ids))
+        venues = get_venues_by_ids(venue_ids)  # e.g. VenueDatabase.get_venues_by_ids
         
-        # Enhance with ML
-        enhancement = await ml_enhancer.enhance_venue(venue_data)
+        # Enhance with ML concurrently
+        enhancements = await ml_enhancer.enhance_venues_batch([asdict(v) for v in venues])
         
-        # Update database with enhancement
-        update_venue_enhancement(venue_id, enhancement)  # Implement this
+        # Update database with enhancements, keyed by venue id
+        results = {}
+        for venue, enhancement in zip(venues, enhancements):
+            update_venue_enhancement(venue.venue_id, enhancement)  # Implement this
+            _cache_store(_enhancement_cache, venue.venue_id, enhancement)
+            results[venue.venue_id] = enhancement
         
-        return {"status": "success", "enhancement": enhancement}
+        missing_ids = [venue_id for venue_id in venue_ids if venue_id not in results]
+        return {"status": "success", "enhancements": results, "missing_ids": missing_ids}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -46,10 +130,11 @@ async def api_enhance_venue(venue_id: int):
 async def api_venue_insights(venue_id: int):
     """Get ML insights for a venue"""
     try:
-        from ml_system.ml_models import MLModelManager
-        ml_manager = MLModelManager()
-        
-        insights = ml_manager.get_venue_insights(str(venue_id))
+        # get_venue_insights is synchronous, so run it off the event loop
+        insights = await _cached(
+            _insights_cache, venue_id,
+            lambda: asyncio.to_thread(ml_manager.get_venue_insights, str(venue_id))
+        )
         return {"status": "success", "insights": insights}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -4,29 +4,46 @@ Discovers and adds venues, cultural organizations, and events to the database
 """
 
 import asyncio
+import atexit
+import ahocorasick
 import aiohttp
-import json
+import diskcache
+import hashlib
+import ijson
+import itertools
+import orjson
+from aiolimiter import AsyncLimiter
 import logging
+import logging.handlers
+import os
+import queue
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass, asdict
-import hashlib
 import re
 from urllib.parse import quote
 import time
 
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+from geo_utils import haversine_bulk
 from ml_system.ml_models import MLModelManager
 try:
     from ml_system.ml_database import MLDatabase
 except ImportError:
     # Create a simple placeholder MLDatabase if the module doesn't exist
     class MLDatabase:
-        def store_discovery_result(self, data):
+        def store_discovery_batch(self, venues):
             pass
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class VenueCandidate:
     """Represents a potential venue discovered from external sources"""
     name: str
@@ -45,7 +62,7 @@ class VenueCandidate:
     confidence_score: Optional[float] = None
     raw_data: Optional[Dict] = None
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class EventCandidate:
     """Represents a potential event discovered from external sources"""
     name: str
@@ -60,46 +77,119 @@ class EventCandidate:
     organizer: Optional[str] = None
     confidence_score: Optional[float] = None
 
+def create_http_session() -> aiohttp.ClientSession:
+    """Create a pooled client session that can be shared across discovery runs"""
+    # Discovery talks to three hosts: cap each one's share of the pool and cache
+    # their DNS answers instead of resolving on every new connection
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=20,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=30, connect=5)
+    )
+
+# Attempts per request, and statuses worth retrying with exponential backoff
+FETCH_MAX_ATTEMPTS = 5
+RETRY_STATUSES = (429, 502, 503, 504)
+MAX_RETRY_DELAY = 60
+
+# Raw Google Places / Yelp search responses reused across runs for a day
+SEARCH_CACHE_DIR = '.venue_cache'
+SEARCH_CACHE_TTL = 24 * 60 * 60
+
 class DataSourceManager:
     """Manages connections to external data sources"""
     
-    def __init__(self):
-        self.session = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        # An injected session is shared and outlives this manager; only close our own
+        self.session = session
+        self._owns_session = session is None
+        self.search_cache = None
         self.api_keys = {
             'google_places': None,  # Set from environment
             'yelp': None,
             'foursquare': None
         }
-        self.rate_limits = {
-            'google_places': {'calls_per_minute': 100, 'last_call': 0},
-            'yelp': {'calls_per_minute': 83, 'last_call': 0},  # 5000/day = ~83/min
-            'nyc_open_data': {'calls_per_minute': 1000, 'last_call': 0}
+        # Token buckets (calls per 60s) shared by every concurrent fetch for a source
+        self.limiters = {
+            'google_places': AsyncLimiter(100, 60),
+            'yelp': AsyncLimiter(83, 60),  # 5000/day = ~83/min
+            'nyc_open_data': AsyncLimiter(1000, 60)
         }
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = create_http_session()
+        self.search_cache = diskcache.Cache(SEARCH_CACHE_DIR)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
+            self.session = None
+        if self.search_cache is not None:
+            self.search_cache.close()
+            self.search_cache = None
     
-    async def _rate_limit_wait(self, source: str):
-        """Implement rate limiting"""
-        if source in self.rate_limits:
-            limit_info = self.rate_limits[source]
-            time_since_last = time.time() - limit_info['last_call']
-            min_interval = 60 / limit_info['calls_per_minute']
+    async def _get_json(self, source: str, url: str, parse_item=None, **kwargs):
+        """GET a JSON document within the source's rate limit, retrying
+        throttled or unavailable responses; returns None on failure.
+        
+        With parse_item, the document must be a top-level array: it is parsed
+        incrementally from the socket and the list of parse_item results returned.
+        """
+        for attempt in range(FETCH_MAX_ATTEMPTS):
+            await self.limiters[source].acquire()
             
-            if time_since_last < min_interval:
-                await asyncio.sleep(min_interval - time_since_last)
+            async with self.session.get(url, **kwargs) as response:
+                if response.status == 200:
+                    if parse_item is None:
+                        return orjson.loads(await response.read())
+                    return [
+                        parse_item(item)
+                        async for item in ijson.items(response.content, 'item', use_float=True)
+                    ]
+                if response.status not in RETRY_STATUSES or attempt == FETCH_MAX_ATTEMPTS - 1:
+                    logging.warning(f"{source} request failed with HTTP {response.status}")
+                    return None
+                delay = self._retry_delay(response.headers.get('Retry-After'), attempt)
             
-            self.rate_limits[source]['last_call'] = time.time()
+            # Sleep after the response is released so the connection goes back to the pool
+            await asyncio.sleep(delay)
+        
+        return None
+    
+    async def _get_cached_json(self, source: str, query: Tuple, url: str,
+                               cacheable=None, **kwargs):
+        """_get_json, reusing today's raw response for the same (source, query).
+        
+        cacheable(data) can veto storing a response, e.g. an API-level error.
+        """
+        key = (source, query, datetime.utcnow().date().isoformat())
+        data = self.search_cache.get(key)
+        if data is None:
+            data = await self._get_json(source, url, **kwargs)
+            if data is not None and (cacheable is None or cacheable(data)):
+                self.search_cache.set(key, data, expire=SEARCH_CACHE_TTL)
+        return data
+    
+    @staticmethod
+    def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+        """Seconds to wait before a retry, preferring the server's Retry-After"""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            # Missing, or an HTTP-date we don't bother parsing
+            delay = 2 ** attempt
+        return min(delay, MAX_RETRY_DELAY)
     
     async def fetch_nyc_cultural_organizations(self) -> List[VenueCandidate]:
         """Fetch cultural organizations from NYC Open Data"""
-        await self._rate_limit_wait('nyc_open_data')
-        
         url = "https://data.cityofnewyork.us/resource/u35m-9t32.json"
         params = {
             '$limit': 1000,
@@ -107,10 +197,9 @@ class DataSourceManager:
         }
         
         try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return [self._parse_cultural_org(org) for org in data]
+            orgs = await self._get_json('nyc_open_data', url, self._parse_cultural_org, params=params)
+            if orgs is not None:
+                return orgs
         except Exception as e:
             logging.error(f"Error fetching NYC cultural orgs: {e}")
         
@@ -121,8 +210,6 @@ class DataSourceManager:
         if not self.api_keys['google_places']:
             return []
         
-        await self._rate_limit_wait('google_places')
-        
         url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
         params = {
             'query': f"{query} in {location}",
@@ -131,10 +218,14 @@ class DataSourceManager:
         }
         
         try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return [self._parse_google_place(place) for place in data.get('results', [])]
+            # Google reports quota and key errors in a 200 body; never cache those
+            data = await self._get_cached_json(
+                'google_places', (query, location), url,
+                cacheable=lambda d: d.get('status') in ('OK', 'ZERO_RESULTS'),
+                params=params
+            )
+            if data is not None:
+                return [self._parse_google_place(place) for place in data.get('results', [])]
         except Exception as e:
             logging.error(f"Error fetching Google Places: {e}")
         
@@ -145,8 +236,6 @@ class DataSourceManager:
         if not self.api_keys['yelp']:
             return []
         
-        await self._rate_limit_wait('yelp')
-        
         url = "https://api.yelp.com/v3/businesses/search"
         headers = {'Authorization': f"Bearer {self.api_keys['yelp']}"}
         params = {
@@ -157,10 +246,11 @@ class DataSourceManager:
         }
         
         try:
-            async with self.session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return [self._parse_yelp_business(biz) for biz in data.get('businesses', [])]
+            data = await self._get_cached_json(
+                'yelp', (term, location), url, headers=headers, params=params
+            )
+            if data is not None:
+                return [self._parse_yelp_business(biz) for biz in data.get('businesses', [])]
         except Exception as e:
             logging.error(f"Error fetching Yelp businesses: {e}")
         
@@ -168,8 +258,6 @@ class DataSourceManager:
     
     async def fetch_nyc_events(self) -> List[EventCandidate]:
         """Fetch events from NYC Open Data"""
-        await self._rate_limit_wait('nyc_open_data')
-        
         url = "https://data.cityofnewyork.us/resource/tvpp-9vvx.json"
         params = {
             '$limit': 500,
@@ -177,10 +265,9 @@ class DataSourceManager:
         }
         
         try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return [self._parse_nyc_event(event) for event in data]
+            events = await self._get_json('nyc_open_data', url, self._parse_nyc_event, params=params)
+            if events is not None:
+                return events
         except Exception as e:
             logging.error(f"Error fetching NYC events: {e}")
         
@@ -248,6 +335,17 @@ class DataSourceManager:
             organizer=event.get('event_agency', '')
         )
 
+# Keywords for rule-based classification, matched as substrings of the
+# lowercased name and categories
+VENUE_TYPE_KEYWORDS = {
+    'dive_bar': ['bar', 'pub', 'tavern', 'saloon'],
+    'dance_club': ['club', 'nightclub', 'disco', 'dance'],
+    'cocktail_lounge': ['lounge', 'cocktail', 'speakeasy'],
+    'rooftop': ['rooftop', 'roof', 'sky'],
+    'cultural_organization': ['museum', 'gallery', 'theater', 'theatre', 'cultural'],
+    'music_venue': ['music', 'concert', 'venue', 'hall', 'stage']
+}
+
 class VenueClassifier:
     """ML-powered venue classification system"""
     
@@ -260,31 +358,38 @@ class VenueClassifier:
             'cultural': ['Museum', 'Theater', 'Art Gallery', 'Cultural Organization'],
             'event_space': ['Event Venue', 'Concert Hall', 'Performance Space']
         }
+        self._keyword_automaton = self._build_keyword_automaton()
+    
+    def _build_keyword_automaton(self) -> ahocorasick.Automaton:
+        """Build one Aho-Corasick automaton over every type keyword"""
+        automaton = ahocorasick.Automaton()
+        for keywords in VENUE_TYPE_KEYWORDS.values():
+            for keyword in keywords:
+                automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _matched_keywords(self, text: str) -> set:
+        """Keywords occurring anywhere in text, found in a single pass"""
+        return {keyword for _, keyword in self._keyword_automaton.iter(text)} if text else set()
     
     def classify_venue_type(self, candidate: VenueCandidate) -> Tuple[str, float]:
         """Classify venue type using ML and rule-based logic"""
         
-        # Rule-based classification
-        name_lower = candidate.name.lower()
-        categories = [cat.lower() for cat in (candidate.categories or [])]
-        
-        # Define keywords for each type
-        type_keywords = {
-            'dive_bar': ['bar', 'pub', 'tavern', 'saloon'],
-            'dance_club': ['club', 'nightclub', 'disco', 'dance'],
-            'cocktail_lounge': ['lounge', 'cocktail', 'speakeasy'],
-            'rooftop': ['rooftop', 'roof', 'sky'],
-            'cultural_organization': ['museum', 'gallery', 'theater', 'theatre', 'cultural'],
-            'music_venue': ['music', 'concert', 'venue', 'hall', 'stage']
-        }
+        # Rule-based classification: one automaton pass over the name and one
+        # over the categories (newline-joined, so no match spans two of them)
+        name_matches = self._matched_keywords(candidate.name.lower())
+        category_matches = self._matched_keywords(
+            '\n'.join(cat.lower() for cat in (candidate.categories or []))
+        )
         
         scores = {}
-        for venue_type, keywords in type_keywords.items():
+        for venue_type, keywords in VENUE_TYPE_KEYWORDS.items():
             score = 0
             for keyword in keywords:
-                if keyword in name_lower:
+                if keyword in name_matches:
                     score += 0.3
-                if any(keyword in cat for cat in categories):
+                if keyword in category_matches:
                     score += 0.4
             scores[venue_type] = score
         
@@ -330,69 +435,217 @@ class VenueClassifier:
             score += 0.05
         
         return min(score, 1.0)
+    
+    def calculate_quality_scores(self, candidates: List[VenueCandidate]) -> np.ndarray:
+        """calculate_quality_score for a whole batch, column-wise with pandas"""
+        df = pd.DataFrame({
+            'name': [c.name or '' for c in candidates],
+            'address': [c.address or '' for c in candidates],
+            'latitude': [c.latitude or 0 for c in candidates],
+            'longitude': [c.longitude or 0 for c in candidates],
+            'rating': [c.rating for c in candidates],
+            'contact': [bool(c.phone or c.website) for c in candidates],
+            'categories': [bool(c.categories) for c in candidates]
+        })
+        df['rating'] = pd.to_numeric(df['rating'])
+        
+        # Same terms, added in the same order, as the per-candidate version
+        score = 0.2 * (df['name'].str.strip().str.len() > 2).to_numpy()
+        score = score + 0.2 * df['address'].str.lower().str.contains('new york', regex=False).to_numpy()
+        in_nyc = (df['latitude'].gt(40.4) & df['latitude'].lt(41.0) &
+                  df['longitude'].gt(-74.3) & df['longitude'].lt(-73.7))
+        score = score + 0.3 * in_nyc.to_numpy()
+        score = score + 0.15 * df['rating'].gt(3.0).to_numpy()
+        score = score + 0.1 * df['contact'].to_numpy()
+        score = score + 0.05 * df['categories'].to_numpy()
+        
+        return np.minimum(score, 1.0)
+    
+    def score_candidates(self, candidates: List[VenueCandidate]):
+        """Set venue_type and confidence_score on every candidate in a batch"""
+        if not candidates:
+            return
+        
+        quality_scores = self.calculate_quality_scores(candidates)
+        for candidate, quality_score in zip(candidates, quality_scores):
+            venue_type, type_confidence = self.classify_venue_type(candidate)
+            candidate.venue_type = venue_type
+            candidate.confidence_score = (type_confidence + float(quality_score)) / 2
+
+# Duplicate radius, and the same radius in degrees of latitude (~111 km each)
+# padded by 20% so the KD-tree query never misses a venue haversine accepts
+DUPLICATE_RADIUS_KM = 0.1
+DUPLICATE_RADIUS_DEG = DUPLICATE_RADIUS_KM / 111.0 * 1.2
+
+# Below this many venues a full vectorized scan beats building a KD-tree
+KDTREE_MIN_VENUES = 256
+
+# TF-IDF cosine above which a name alone marks a duplicate; below it a
+# candidate is still checked against venues within DUPLICATE_RADIUS_KM
+NAME_MATCH_THRESHOLD = 0.8
+
+# Candidates scored per sparse product, bounding the similarity matrix size
+NAME_MATCH_CHUNK = 256
+
+# Name normalization patterns, compiled once for every venue and candidate
+_RE_ARTICLES = re.compile(r'\b(the|a|an)\b', re.IGNORECASE)
+_RE_PUNCT = re.compile(r'[^\w\s]')
+_RE_WS = re.compile(r'\s+')
+
+# Engine from the last run, reused while the venues are unchanged:
+# (content hash, DeduplicationEngine); see DeduplicationEngine.load_or_build
+_dedup_cache = None
 
 class DeduplicationEngine:
     """Intelligent deduplication to prevent duplicate venues"""
     
     def __init__(self, existing_venues: List[Dict]):
         self.existing_venues = existing_venues
-        self.name_hashes = self._create_name_hashes()
+        self.name_index = self._create_name_index()
+        
+        # Coordinates as contiguous arrays so proximity is one compiled pass per candidate
+        self._set_coordinates(
+            np.array([v.get('latitude') or 0 for v in existing_venues], dtype=np.float64),
+            np.array([v.get('longitude') or 0 for v in existing_venues], dtype=np.float64)
+        )
+        
+        # Character n-gram TF-IDF over existing names for batch fuzzy matching
+        self.name_vectorizer, self.name_matrix = self._build_name_vectors()
+    
+    @staticmethod
+    def venues_hash(venues: List[Dict]) -> str:
+        """Hash of every field the engine indexes, so any rename, move, insert
+        or delete gives a different value"""
+        fields = [(v.get('id'), v.get('name'), v.get('latitude'), v.get('longitude'))
+                  for v in venues]
+        return hashlib.sha256(orjson.dumps(fields, default=str)).hexdigest()
+    
+    @classmethod
+    def load_or_build(cls, existing_venues: List[Dict]) -> 'DeduplicationEngine':
+        """Reuse the engine built by an earlier run in this process if the venues
+        are unchanged; otherwise build (and fit) a new one"""
+        global _dedup_cache
+        
+        venues_hash = cls.venues_hash(existing_venues)
+        if _dedup_cache is not None and _dedup_cache[0] == venues_hash:
+            return _dedup_cache[1]
+        
+        engine = cls(existing_venues)
+        _dedup_cache = (venues_hash, engine)
+        return engine
+    
+    def _set_coordinates(self, lat_arr: np.ndarray, lon_arr: np.ndarray):
+        """Store coordinate arrays and rebuild what is derived from them"""
+        self.lat_arr = lat_arr.astype(np.float64, copy=False)
+        self.lon_arr = lon_arr.astype(np.float64, copy=False)
+        
+        # Scale longitude by cos(latitude) so a degree-radius is round on the ground
+        self.lon_scale = float(np.cos(np.radians(np.median(self.lat_arr)))) if self.lat_arr.size else 1.0
+        self.tree = self._build_spatial_index()
+    
+    def _build_name_vectors(self):
+        """Fit TF-IDF on normalized existing names; (None, None) if there are none"""
+        vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(3, 5))
+        try:
+            matrix = vectorizer.fit_transform(
+                [self._normalize_name(v.get('name', '')) for v in self.existing_venues]
+            )
+        except ValueError:
+            # Empty vocabulary: no venues, or no name long enough for an n-gram
+            return None, None
+        return vectorizer, matrix.T.tocsr()
+    
+    def _build_spatial_index(self):
+        """Build a KD-tree over projected coordinates, or None to scan instead"""
+        if cKDTree is None or len(self.existing_venues) < KDTREE_MIN_VENUES:
+            return None
+        return cKDTree(np.column_stack([self.lat_arr, self.lon_arr * self.lon_scale]))
     
-    def _create_name_hashes(self) -> Dict[str, Dict]:
-        """Create hashes for existing venue names"""
-        hashes = {}
-        for venue in self.existing_venues:
-            normalized_name = self._normalize_name(venue.get('name', ''))
-            name_hash = hashlib.md5(normalized_name.encode()).hexdigest()
-            hashes[name_hash] = venue
-        return hashes
+    def _nearby_indices(self, lat: float, lon: float) -> np.ndarray:
+        """Indices of existing venues within DUPLICATE_RADIUS_KM of a coordinate"""
+        if self.tree is None:
+            return np.flatnonzero(self._haversine_vec(lat, lon) < DUPLICATE_RADIUS_KM)
+        
+        # KD-tree narrows to a handful of neighbors; haversine confirms them
+        neighbors = np.asarray(
+            self.tree.query_ball_point([lat, lon * self.lon_scale], r=DUPLICATE_RADIUS_DEG),
+            dtype=np.intp
+        )
+        if neighbors.size == 0:
+            return neighbors
+        distances = self._haversine_vec(lat, lon, neighbors)
+        return neighbors[distances < DUPLICATE_RADIUS_KM]
+    
+    def _create_name_index(self) -> Dict[str, Dict]:
+        """Index existing venues by normalized name"""
+        return {self._normalize_name(venue.get('name', '')): venue for venue in self.existing_venues}
     
     def _normalize_name(self, name: str) -> str:
         """Normalize venue name for comparison"""
         # Remove common suffixes and prefixes
-        name = re.sub(r'\b(the|a|an)\b', '', name, flags=re.IGNORECASE)
+        name = _RE_ARTICLES.sub('', name)
         # Remove special characters and extra spaces
-        name = re.sub(r'[^\w\s]', '', name)
-        name = re.sub(r'\s+', ' ', name).strip().lower()
-        return name
+        name = _RE_PUNCT.sub('', name)
+        return _RE_WS.sub(' ', name).strip().lower()
     
     def is_duplicate(self, candidate: VenueCandidate) -> Tuple[bool, Optional[Dict]]:
         """Check if candidate is a duplicate of existing venue"""
         
         # Check name similarity
         normalized_candidate = self._normalize_name(candidate.name)
-        candidate_hash = hashlib.md5(normalized_candidate.encode()).hexdigest()
-        
-        if candidate_hash in self.name_hashes:
-            return True, self.name_hashes[candidate_hash]
-        
-        # Check location proximity (within 100 meters)
-        for venue in self.existing_venues:
-            if self._calculate_distance(
-                candidate.latitude, candidate.longitude,
-                venue.get('latitude', 0), venue.get('longitude', 0)
-            ) < 0.1:  # 100 meters
-                # Also check name similarity
-                similarity = self._name_similarity(candidate.name, venue.get('name', ''))
-                if similarity > 0.8:
-                    return True, venue
         
-        return False, None
-    
-    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two coordinates in kilometers"""
-        R = 6371  # Earth's radius in kilometers
-        
-        lat1_rad = np.radians(lat1)
-        lat2_rad = np.radians(lat2)
-        delta_lat = np.radians(lat2 - lat1)
-        delta_lon = np.radians(lon2 - lon1)
+        if normalized_candidate in self.name_index:
+            return True, self.name_index[normalized_candidate]
         
-        a = (np.sin(delta_lat/2)**2 + 
-             np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon/2)**2)
-        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+        return self._nearby_duplicate(candidate)
+    
+    def batch_is_duplicate(self, candidates: List[VenueCandidate]) -> List[Tuple[bool, Optional[Dict]]]:
+        """Check many candidates at once using TF-IDF cosine similarity on names"""
+        if self.name_matrix is None:
+            return [self.is_duplicate(candidate) for candidate in candidates]
+        
+        results = []
+        for start in range(0, len(candidates), NAME_MATCH_CHUNK):
+            chunk = candidates[start:start + NAME_MATCH_CHUNK]
+            normalized = [self._normalize_name(candidate.name) for candidate in chunk]
+            
+            # TF-IDF rows are L2-normalized, so the sparse product is cosine similarity
+            sims = self.name_vectorizer.transform(normalized) @ self.name_matrix
+            best_idx = np.asarray(sims.argmax(axis=1)).ravel()
+            best_sim = sims.max(axis=1).toarray().ravel()
+            
+            for candidate, name, idx, sim in zip(chunk, normalized, best_idx, best_sim):
+                if name in self.name_index:
+                    results.append((True, self.name_index[name]))
+                elif sim > NAME_MATCH_THRESHOLD:
+                    results.append((True, self.existing_venues[idx]))
+                else:
+                    # Not conclusive by name: same proximity check as is_duplicate
+                    results.append(self._nearby_duplicate(candidate))
+        
+        return results
+    
+    def _nearby_duplicate(self, candidate: VenueCandidate) -> Tuple[bool, Optional[Dict]]:
+        """Match a candidate against similarly named venues within DUPLICATE_RADIUS_KM"""
+        # Check location proximity (within 100 meters), then name similarity
+        # only for the few venues that are that close
+        for idx in self._nearby_indices(candidate.latitude, candidate.longitude):
+            venue = self.existing_venues[idx]
+            similarity = self._name_similarity(candidate.name, venue.get('name', ''))
+            if similarity > 0.8:
+                return True, venue
         
-        return R * c
+        return False, None
+    
+    def _haversine_vec(self, cand_lat: float, cand_lon: float,
+                       idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """Distance in kilometers from a coordinate to existing venues (all, or idx)"""
+        lat_arr, lon_arr = self.lat_arr, self.lon_arr
+        if idx is not None:
+            lat_arr, lon_arr = lat_arr[idx], lon_arr[idx]
+        
+        # Numba-compiled kernel shared with the nearest-venue lookups
+        return haversine_bulk(lat_arr, lon_arr, cand_lat, cand_lon)
     
     def _name_similarity(self, name1: str, name2: str) -> float:
         """Calculate name similarity using Jaccard similarity"""
@@ -409,24 +662,49 @@ class DeduplicationEngine:
         
         return len(intersection) / len(union)
 
+# Background thread writing venue_discovery.log (see _setup_logging)
+_log_listener = None
+
+# Source requests in flight at the same time during a discovery run
+FETCH_CONCURRENCY = 16
+
+# Candidates processed (classified and written) at the same time
+CANDIDATE_CONCURRENCY = 32
+
+# Accepted venues buffered before one batched database write
+DISCOVERY_BATCH_SIZE = 100
+
 class AutomatedVenueDiscovery:
     """Main orchestrator for automated venue discovery"""
     
-    def __init__(self, db_connection=None):
+    def __init__(self, db_connection=None, http_session: Optional[aiohttp.ClientSession] = None):
+        self.http_session = http_session
         self.ml_manager = MLModelManager()
         self.ml_db = MLDatabase()
         self.classifier = VenueClassifier(self.ml_manager)
         self.logger = self._setup_logging()
+        self._pending: List[Dict] = []
+        self._id_gen = itertools.count(1)
         
     def _setup_logging(self) -> logging.Logger:
         """Setup logging for the discovery system"""
+        global _log_listener
+        
         logger = logging.getLogger('venue_discovery')
         logger.setLevel(logging.INFO)
         
-        handler = logging.FileHandler('venue_discovery.log')
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        # The event loop only enqueues records; a listener thread does the file
+        # writes. Installed once per process, however many instances are created
+        if _log_listener is None:
+            handler = logging.FileHandler('venue_discovery.log', delay=True)
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            
+            log_queue = queue.Queue(-1)
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            _log_listener = logging.handlers.QueueListener(log_queue, handler)
+            _log_listener.start()
+            atexit.register(_log_listener.stop)
         
         return logger
     
@@ -443,9 +721,9 @@ class AutomatedVenueDiscovery:
         
         # Get existing venues for deduplication
         existing_venues = await self._get_existing_venues()
-        dedup_engine = DeduplicationEngine(existing_venues)
+        dedup_engine = DeduplicationEngine.load_or_build(existing_venues)
         
-        async with DataSourceManager() as source_manager:
+        async with DataSourceManager(self.http_session) as source_manager:
             all_candidates = []
             
             # Fetch from multiple sources
@@ -461,8 +739,15 @@ class AutomatedVenueDiscovery:
                     source_manager.fetch_yelp_businesses(term)
                 ])
             
-            # Execute all tasks concurrently
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Execute tasks concurrently, but only FETCH_CONCURRENCY requests in
+            # flight at once; the per-source limiters pace the request rate
+            fetch_semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+            
+            async def fetch(task):
+                async with fetch_semaphore:
+                    return await task
+            
+            results = await asyncio.gather(*(fetch(t) for t in tasks), return_exceptions=True)
             
             # Combine results
             for result in results:
@@ -474,44 +759,100 @@ class AutomatedVenueDiscovery:
             stats['total_found'] = len(all_candidates)
             self.logger.info(f"Found {len(all_candidates)} venue candidates")
             
-            # Process candidates
-            for candidate in all_candidates:
-                try:
-                    processed = await self._process_candidate(candidate, dedup_engine)
-                    
-                    if processed['action'] == 'added':
-                        stats['added'] += 1
-                    elif processed['action'] == 'duplicate':
-                        stats['duplicates'] += 1
-                    else:
-                        stats['rejected'] += 1
-                        
-                except Exception as e:
-                    self.logger.error(f"Error processing candidate {candidate.name}: {e}")
+            # Events have no coordinates or categories and can never be added
+            # as venues; count them as rejected instead of failing each one
+            venue_candidates = [c for c in all_candidates if isinstance(c, VenueCandidate)]
+            stats['rejected'] += len(all_candidates) - len(venue_candidates)
+            
+            # Sources can return null coordinates (Yelp does for some businesses);
+            # such venues can't be located or deduplicated, so reject them up front
+            located_candidates = [
+                c for c in venue_candidates
+                if isinstance(c.latitude, (int, float)) and isinstance(c.longitude, (int, float))
+            ]
+            stats['rejected'] += len(venue_candidates) - len(located_candidates)
+            venue_candidates = located_candidates
+            
+            # Sources overlap (the same venue from Google and Yelp, or from two
+            # search terms); keep the first copy so the rest skip all further work
+            unique_candidates = {}
+            for candidate in venue_candidates:
+                key = (dedup_engine._normalize_name(candidate.name),
+                       round(candidate.latitude, 4), round(candidate.longitude, 4))
+                unique_candidates.setdefault(key, candidate)
+            stats['duplicates'] += len(venue_candidates) - len(unique_candidates)
+            venue_candidates = list(unique_candidates.values())
+            
+            # Deduplicate the whole batch at once and score the new ones together,
+            # then process candidates concurrently
+            duplicates = self._check_duplicates(dedup_engine, venue_candidates)
+            self.classifier.score_candidates([
+                c for c, duplicate in zip(venue_candidates, duplicates)
+                if not isinstance(duplicate, Exception) and not duplicate[0]
+            ])
+            semaphore = asyncio.Semaphore(CANDIDATE_CONCURRENCY)
+            
+            async def process(candidate, duplicate):
+                async with semaphore:
+                    return await self._process_candidate(candidate, duplicate)
+            
+            results = await asyncio.gather(
+                *(process(c, d) for c, d in zip(venue_candidates, duplicates)),
+                return_exceptions=True
+            )
+            
+            for candidate, processed in zip(venue_candidates, results):
+                if isinstance(processed, Exception):
+                    self.logger.error(f"Error processing candidate {candidate.name}: {processed}")
+                    stats['rejected'] += 1
+                elif processed['action'] == 'added':
+                    stats['added'] += 1
+                elif processed['action'] == 'duplicate':
+                    stats['duplicates'] += 1
+                else:
                     stats['rejected'] += 1
         
+        # Write whatever is left from the last partial batch
+        await self._flush_batch()
+        
         self.logger.info(f"Discovery complete: {stats}")
         return stats
     
-    async def _process_candidate(self, candidate: VenueCandidate, dedup_engine: DeduplicationEngine) -> Dict:
-        """Process a single venue candidate"""
+    def _check_duplicates(self, dedup_engine: 'DeduplicationEngine',
+                          candidates: List[VenueCandidate]) -> List:
+        """Deduplicate candidates as a batch, falling back to one at a time on error
+        
+        A candidate whose own check fails gets the exception in its slot, so
+        only that candidate is rejected.
+        """
+        try:
+            return dedup_engine.batch_is_duplicate(candidates)
+        except Exception as e:
+            self.logger.error(f"Batch duplicate check failed, checking candidates individually: {e}")
+        
+        duplicates = []
+        for candidate in candidates:
+            try:
+                duplicates.append(dedup_engine.is_duplicate(candidate))
+            except Exception as e:
+                duplicates.append(e)
+        return duplicates
+    
+    async def _process_candidate(self, candidate: VenueCandidate,
+                                 duplicate: Union[Tuple[bool, Optional[Dict]], Exception]) -> Dict:
+        """Process a single venue candidate given its deduplication result"""
+        
+        # Its duplicate check failed (see _check_duplicates)
+        if isinstance(duplicate, Exception):
+            raise duplicate
         
         # Check for duplicates
-        is_dup, existing_venue = dedup_engine.is_duplicate(candidate)
+        is_dup, existing_venue = duplicate
         if is_dup:
             return {'action': 'duplicate', 'existing_venue': existing_venue}
         
-        # Classify venue type
-        venue_type, type_confidence = self.classifier.classify_venue_type(candidate)
-        
-        # Calculate quality score
-        quality_score = self.classifier.calculate_quality_score(candidate)
-        
-        # Set overall confidence
-        candidate.confidence_score = (type_confidence + quality_score) / 2
-        candidate.venue_type = venue_type
-        
-        # Quality threshold
+        # Quality threshold (venue_type and confidence_score were set for the
+        # whole batch by VenueClassifier.score_candidates)
         if candidate.confidence_score < 0.6:
             return {'action': 'rejected', 'reason': 'low_quality', 'score': candidate.confidence_score}
         
@@ -545,21 +886,35 @@ class AutomatedVenueDiscovery:
                 'source': candidate.source,
                 'confidence_score': candidate.confidence_score,
                 'discovered_at': datetime.now().isoformat(),
-                'raw_data': json.dumps(candidate.raw_data) if candidate.raw_data else None
+                'raw_data': orjson.dumps(candidate.raw_data).decode() if candidate.raw_data else None
             }
             
             # This would use your actual database connection
             # venue_id = database.add_venue(venue_data)
-            venue_id = hash(candidate.name) % 10000  # Placeholder
+            venue_id = next(self._id_gen)  # Placeholder, unique within this instance
             
-            # Also add to ML database for analytics
-            await self.ml_db.store_discovery_result(venue_data)
+            # Also add to ML database for analytics, DISCOVERY_BATCH_SIZE at a time
+            self._pending.append(venue_data)
+            if len(self._pending) >= DISCOVERY_BATCH_SIZE:
+                await self._flush_batch()
             
             return venue_id
             
         except Exception as e:
             self.logger.error(f"Database error adding venue {candidate.name}: {e}")
             return None
+    
+    async def _flush_batch(self):
+        """Write buffered venues to the ML database in a single transaction"""
+        # Swap the buffer before awaiting so concurrent candidates start a new batch
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        try:
+            await asyncio.to_thread(self.ml_db.store_discovery_batch, batch)
+        except Exception as e:
+            self.logger.error(f"Database error storing {len(batch)} discovered venues: {e}")
 
 # Usage example and scheduler
 async def run_discovery_pipeline():
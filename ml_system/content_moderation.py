@@ -3,14 +3,30 @@ Content Moderation and ML Training System
 Allows admin approval/denial of AI-generated content to train the ML models
 """
 
+import asyncio
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass, asdict
 import logging
 
+try:
+    import orjson
+    
+    def _dumps(obj) -> str:
+        # Decoded so JSON columns keep TEXT storage (bytes would bind as BLOB)
+        return orjson.dumps(obj).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
 class ModerationStatus(Enum):
     PENDING = "pending"
     APPROVED = "approved" 
@@ -24,6 +40,99 @@ class ContentType(Enum):
     DISCOVERY_RESULT = "discovery_result"
     ENHANCEMENT = "enhancement"
 
+# Enum members by stored value; a dict lookup skips Enum.__call__ on every row
+_CT_BY_VALUE = {ct.value: ct for ct in ContentType}
+_MS_BY_VALUE = {ms.value: ms for ms in ModerationStatus}
+
+# Hot statements, kept as constants so every call hands the pooled connection's
+# statement cache the same SQL text (see _connect)
+_INSERT_MODERATION_MANY_PREFIX = '''
+    INSERT INTO content_moderation 
+    (venue_id, content_type, original_content, ai_generated_content, confidence_score)
+    VALUES '''
+
+_INSERT_MODERATION = _INSERT_MODERATION_MANY_PREFIX + '(?, ?, ?, ?, ?) RETURNING id'
+
+# Rows per submit_many INSERT; 5 parameters each stays well under SQLite's limit
+SUBMIT_MANY_CHUNK = 500
+
+_UPSERT_ADMIN_PREFERENCE = '''
+    INSERT INTO admin_content_preferences 
+    (preference_type, preference_value, examples, weight)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(preference_type) DO UPDATE SET
+        preference_value = excluded.preference_value,
+        examples = excluded.examples,
+        weight = excluded.weight,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+# Statements shared by the single-item and bulk moderation paths
+
+# Moderation rows as the training/apply helpers unpack them:
+# (id, venue_id, content_type, original_content length, ai_generated_content,
+#  confidence_score, venue name, venue_type, neighborhood, instagram_handle).
+# Only the length of the original content is used, so SQLite measures it
+# instead of copying the text out
+_SELECT_MODERATION_ROWS = '''
+    SELECT cm.id, cm.venue_id, cm.content_type, COALESCE(length(cm.original_content), 0),
+           cm.ai_generated_content, cm.confidence_score,
+           v.name, v.venue_type, v.neighborhood, v.instagram_handle
+    FROM content_moderation cm
+    LEFT JOIN venues v ON cm.venue_id = v.id
+'''
+
+# Records a decision and returns the row in _SELECT_MODERATION_ROWS layout in
+# the same statement; RETURNING can't join, so venue fields are subqueries
+_UPDATE_MODERATION_STATUS = '''
+    UPDATE content_moderation 
+    SET status = ?, reviewed_at = CURRENT_TIMESTAMP, 
+        reviewed_by = ?, admin_feedback = ?, revision_notes = ?
+    WHERE id = ?
+    RETURNING id, venue_id, content_type, COALESCE(length(original_content), 0),
+              ai_generated_content, confidence_score,
+              (SELECT name FROM venues WHERE venues.id = content_moderation.venue_id),
+              (SELECT venue_type FROM venues WHERE venues.id = content_moderation.venue_id),
+              (SELECT neighborhood FROM venues WHERE venues.id = content_moderation.venue_id),
+              (SELECT instagram_handle FROM venues WHERE venues.id = content_moderation.venue_id)
+'''
+
+_INSERT_TRAINING_DATA = '''
+    INSERT INTO ml_training_data 
+    (moderation_id, venue_id, content_type, input_features, expected_output, 
+     feedback_type, admin_notes, venue_context)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Same insert fed by one JSON array of _training_data_record rows, so SQLite
+# iterates the batch itself; the nested feature/context objects come back out
+# of json_extract as JSON text
+_INSERT_TRAINING_DATA_JSON = '''
+    INSERT INTO ml_training_data 
+    (moderation_id, venue_id, content_type, input_features, expected_output, 
+     feedback_type, admin_notes, venue_context)
+    SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]'),
+           json_extract(value, '$[2]'), json_extract(value, '$[3]'),
+           json_extract(value, '$[4]'), json_extract(value, '$[5]'),
+           json_extract(value, '$[6]'), json_extract(value, '$[7]')
+    FROM json_each(?)
+'''
+
+# Venue column updates for approved content, by content type value;
+# parameters are (approved_content, venue_id)
+_APPLY_CONTENT_SQL = {
+    ContentType.VENUE_DESCRIPTION.value: '''
+        UPDATE venues 
+        SET ml_enhanced_description = ?, ml_last_enhanced = CURRENT_TIMESTAMP
+        WHERE id = ?
+    ''',
+    ContentType.ATMOSPHERE_TAGS.value: '''
+        UPDATE venues 
+        SET ml_atmosphere_tags = ?, ml_last_enhanced = CURRENT_TIMESTAMP
+        WHERE id = ?
+    '''
+}
+
 @dataclass
 class ModerationItem:
     id: Optional[int]
@@ -52,14 +161,51 @@ class ContentModerationSystem:
     
     def __init__(self, db_path: str = "nightlife.db"):
         self.db_path = db_path
+        
+        # Long-lived connections: one read-only connection per thread and a
+        # single writer shared under a lock, so SQLite's page cache stays warm
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._readers: List[sqlite3.Connection] = []
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
+        
+        # Admin preferences rarely change; get_admin_preferences reuses each
+        # thread's last read (self._local.prefs) while this process's edit count
+        # and its reader's PRAGMA data_version still match
+        self._prefs_version = 0
+        
         self.init_moderation_tables()
         self.logger = logging.getLogger(__name__)
     
+    def _connect(self, isolation_level: Optional[str] = "", readonly: bool = False) -> sqlite3.Connection:
+        """Open a connection with the moderation tuning pragmas applied
+        
+        Pass isolation_level=None to manage transactions with explicit BEGIN/COMMIT.
+        Pooled connections may be closed from another thread (see close()). They
+        live long enough for a large statement cache to keep every query compiled.
+        """
+        if readonly:
+            database = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+        else:
+            database = self.db_path
+        conn = sqlite3.connect(database, isolation_level=isolation_level,
+                               uri=readonly, check_same_thread=False,
+                               cached_statements=256)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-64000')
+        conn.execute('PRAGMA mmap_size=268435456')
+        return conn
+    
     def init_moderation_tables(self):
         """Initialize moderation and training tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._acquire_rw() as conn:
             cursor = conn.cursor()
             
+            # WAL is persistent, so setting it once here covers every later connection
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
             # Content moderation queue
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS content_moderation (
@@ -110,83 +256,160 @@ class ContentModerationSystem:
                 )
             ''')
             
+            # Create indexes for the queue, auto-approval and training data filters
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cm_pending_created ON content_moderation(status, created_at DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cm_status_conf ON content_moderation(status, confidence_score)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_mtd_ctype_fb_created ON ml_training_data(content_type, feedback_type, created_at DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_mtd_fb_created ON ml_training_data(feedback_type, created_at DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_mtd_created ON ml_training_data(created_at DESC)")
+            
+            # One preference per type; keep the newest row of any duplicates a
+            # racing SELECT-then-INSERT left behind before enforcing it
+            cursor.execute('''
+                DELETE FROM admin_content_preferences
+                WHERE id NOT IN (
+                    SELECT MAX(id) FROM admin_content_preferences GROUP BY preference_type
+                )
+            ''')
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_admin_pref_type ON admin_content_preferences(preference_type)")
+            
+            conn.commit()
+    
+    @contextmanager
+    def _acquire_ro(self):
+        """Yield this thread's pooled read-only connection"""
+        conn = getattr(self._local, 'reader', None)
+        if conn is None:
+            conn = self._connect(readonly=True)
+            self._local.reader = conn
+            with self._pool_lock:
+                self._readers.append(conn)
+        yield conn
+    
+    @contextmanager
+    def _acquire_rw(self):
+        """Yield the pooled writer connection (autocommit mode), held exclusively"""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect(isolation_level=None)
+            yield self._writer
+    
+    def close(self):
+        """Close every pooled connection"""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._pool_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self._local = threading.local()
+    
+    @contextmanager
+    def _write_txn(self):
+        """Yield a cursor inside a BEGIN IMMEDIATE transaction.
+        
+        Commits when the block exits normally and rolls back on error. Taking
+        the write lock up front avoids a mid-transaction lock upgrade failing
+        with SQLITE_BUSY, and every statement shares one commit.
+        """
+        # The writer runs with isolation_level=None: no implicit BEGINs
+        with self._acquire_rw() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                conn.rollback()
+                raise
             conn.commit()
     
     def submit_for_moderation(self, venue_id: str, content_type: ContentType, 
                             original_content: str, ai_generated_content: str, 
                             confidence_score: float) -> int:
         """Submit AI-generated content for admin moderation"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO content_moderation 
-                (venue_id, content_type, original_content, ai_generated_content, confidence_score)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (venue_id, content_type.value, original_content, ai_generated_content, confidence_score))
+        with self._write_txn() as cursor:
+            cursor.execute(_INSERT_MODERATION, (venue_id, content_type.value, original_content, ai_generated_content, confidence_score))
             
-            moderation_id = cursor.lastrowid
-            conn.commit()
+            moderation_id = cursor.fetchone()[0]
             
             self.logger.info(f"Submitted content for moderation: {moderation_id}")
             return moderation_id
     
-    def get_pending_moderation_items(self, limit: int = 50) -> List[ModerationItem]:
-        """Get pending items for admin review"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+    def submit_many(self, items: List[Tuple[str, ContentType, str, str, float]]) -> List[int]:
+        """Submit several AI-generated items for moderation in one transaction
+        
+        Each item is (venue_id, content_type, original_content, ai_generated_content,
+        confidence_score), as for submit_for_moderation. Returns the moderation ids
+        in the same order.
+        """
+        moderation_ids = []
+        with self._write_txn() as cursor:
+            # Multi-row VALUES so RETURNING hands back every id (executemany drops
+            # RETURNING rows); chunked to stay under SQLite's bound-variable limit
+            for start in range(0, len(items), SUBMIT_MANY_CHUNK):
+                chunk = items[start:start + SUBMIT_MANY_CHUNK]
+                params = []
+                for venue_id, content_type, original_content, ai_generated_content, confidence_score in chunk:
+                    params.extend((venue_id, content_type.value, original_content,
+                                   ai_generated_content, confidence_score))
+                cursor.execute(
+                    _INSERT_MODERATION_MANY_PREFIX
+                    + ', '.join(['(?, ?, ?, ?, ?)'] * len(chunk))
+                    + ' RETURNING id',
+                    params
+                )
+                # RETURNING order is unspecified; AUTOINCREMENT ids follow insert order
+                moderation_ids.extend(sorted(row[0] for row in cursor.fetchall()))
+        
+        self.logger.info(f"Submitted {len(moderation_ids)} items for moderation")
+        return moderation_ids
+    
+    def get_pending_moderation_items(self, limit: int = 50,
+                                     before: Optional[Tuple[str, int]] = None) -> List[ModerationItem]:
+        """Get pending items for admin review
+        
+        Pass the (created_at, id) of the last item already shown as `before` to
+        fetch the next page; the query seeks straight to it instead of skipping rows.
+        """
+        with self._acquire_ro() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT cm.*, v.name as venue_name 
-                FROM content_moderation cm
-                LEFT JOIN venues v ON cm.venue_id = v.id
-                WHERE cm.status = 'pending'
-                ORDER BY cm.created_at DESC
-                LIMIT ?
-            ''', (limit,))
-            
-            items = []
-            for row in cursor.fetchall():
-                item = ModerationItem(
-                    id=row['id'],
-                    venue_id=row['venue_id'],
-                    content_type=ContentType(row['content_type']),
-                    original_content=row['original_content'] or '',
-                    ai_generated_content=row['ai_generated_content'],
-                    admin_feedback=row['admin_feedback'],
-                    status=ModerationStatus(row['status']),
-                    confidence_score=row['confidence_score'] or 0.0,
-                    created_at=row['created_at'],
-                    reviewed_at=row['reviewed_at'],
-                    reviewed_by=row['reviewed_by'],
-                    revision_notes=row['revision_notes']
-                )
-                items.append(item)
+            # Columns in ModerationItem field order, so rows map positionally
+            query = '''
+                SELECT id, venue_id, content_type, COALESCE(original_content, ''),
+                       ai_generated_content, admin_feedback, status,
+                       COALESCE(confidence_score, 0.0), created_at, reviewed_at,
+                       reviewed_by, revision_notes
+                FROM content_moderation
+                WHERE status = 'pending'
+            '''
+            params = []
+            
+            if before:
+                query += ' AND (created_at, id) < (?, ?)'
+                params.extend(before)
             
-            return items
+            # id breaks created_at ties so pages neither overlap nor skip rows
+            query += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+            params.append(limit)
+            
+            cursor.execute(query, params)
+            
+            return [
+                ModerationItem(row[0], row[1], _CT_BY_VALUE[row[2]], row[3], row[4], row[5],
+                               _MS_BY_VALUE[row[6]], *row[7:])
+                for row in cursor
+            ]
     
     def moderate_content(self, moderation_id: int, status: ModerationStatus, 
                         admin_username: str, feedback: str = None, 
                         revision_notes: str = None) -> bool:
         """Admin approves/rejects content and trains ML"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Update moderation status
-            cursor.execute('''
-                UPDATE content_moderation 
-                SET status = ?, reviewed_at = CURRENT_TIMESTAMP, 
-                    reviewed_by = ?, admin_feedback = ?, revision_notes = ?
-                WHERE id = ?
-            ''', (status.value, admin_username, feedback, revision_notes, moderation_id))
-            
-            # Get the moderation item for training data
-            cursor.execute('''
-                SELECT cm.*, v.name, v.venue_type, v.neighborhood, v.instagram_handle
-                FROM content_moderation cm
-                LEFT JOIN venues v ON cm.venue_id = v.id
-                WHERE cm.id = ?
-            ''', (moderation_id,))
+        with self._write_txn() as cursor:
+            # Update moderation status, getting the item back for training data
+            cursor.execute(_UPDATE_MODERATION_STATUS, (status.value, admin_username, feedback, revision_notes, moderation_id))
             
             row = cursor.fetchone()
             if not row:
@@ -199,17 +422,23 @@ class ContentModerationSystem:
             if status == ModerationStatus.APPROVED:
                 self._apply_approved_content(cursor, row)
             
-            conn.commit()
             return True
     
     def _create_training_data(self, cursor, moderation_row, status: ModerationStatus, feedback: str):
         """Create training data from admin feedback"""
-        venue_context = {
-            'name': moderation_row[8],  # venue name
-            'venue_type': moderation_row[9],
-            'neighborhood': moderation_row[10],
-            'instagram_handle': moderation_row[11]
-        }
+        cursor.execute(_INSERT_TRAINING_DATA, self._training_data_params(moderation_row, status, feedback))
+    
+    def _training_data_params(self, moderation_row, status: ModerationStatus, feedback: str) -> Tuple:
+        """Build the _INSERT_TRAINING_DATA parameters for a moderation decision"""
+        record = self._training_data_record(moderation_row, status, feedback)
+        record[3] = _dumps(record[3])
+        record[7] = _dumps(record[7])
+        return tuple(record)
+    
+    def _training_data_record(self, moderation_row, status: ModerationStatus, feedback: str) -> List:
+        """Build the ml_training_data row for a moderation decision, JSON fields unencoded"""
+        moderation_id, venue_id, content_type, _, ai_generated_content, _, *venue = moderation_row
+        venue_context = dict(zip(('name', 'venue_type', 'neighborhood', 'instagram_handle'), venue))
         
         # Determine feedback type
         feedback_type = 'positive' if status == ModerationStatus.APPROVED else 'negative'
@@ -220,45 +449,41 @@ class ContentModerationSystem:
         input_features = self._extract_input_features(moderation_row, venue_context)
         
         # Expected output is the approved content or admin's preferred version
-        expected_output = moderation_row[4]  # ai_generated_content
+        expected_output = ai_generated_content
         if status == ModerationStatus.REJECTED and feedback:
             # Admin provided better content
             expected_output = feedback
         
-        cursor.execute('''
-            INSERT INTO ml_training_data 
-            (moderation_id, venue_id, content_type, input_features, expected_output, 
-             feedback_type, admin_notes, venue_context)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            moderation_row[0],  # moderation_id
-            moderation_row[1],  # venue_id
-            moderation_row[2],  # content_type
-            json.dumps(input_features),
+        return [
+            moderation_id,
+            venue_id,
+            content_type,
+            input_features,
             expected_output,
             feedback_type,
             feedback,
-            json.dumps(venue_context)
-        ))
+            venue_context
+        ]
     
     def _extract_input_features(self, moderation_row, venue_context: Dict) -> Dict:
         """Extract input features for ML training"""
         content_type = moderation_row[2]
+        original_content_length = moderation_row[3]
         
         base_features = {
             'venue_name': venue_context['name'],
             'venue_type': venue_context['venue_type'],
             'neighborhood': venue_context['neighborhood'],
             'has_instagram': bool(venue_context.get('instagram_handle')),
-            'original_content_length': len(moderation_row[3] or ''),
-            'confidence_score': moderation_row[6] or 0.0
+            'original_content_length': original_content_length,
+            'confidence_score': moderation_row[5] or 0.0
         }
         
         # Add content-type specific features
         if content_type == ContentType.VENUE_DESCRIPTION.value:
             base_features.update({
                 'description_type': 'enhancement',
-                'has_original_description': bool(moderation_row[3])
+                'has_original_description': original_content_length > 0
             })
         elif content_type == ContentType.ATMOSPHERE_TAGS.value:
             base_features.update({
@@ -274,58 +499,40 @@ class ContentModerationSystem:
         content_type = moderation_row[2]
         approved_content = moderation_row[4]
         
-        if content_type == ContentType.VENUE_DESCRIPTION.value:
-            cursor.execute('''
-                UPDATE venues 
-                SET ml_enhanced_description = ?, ml_last_enhanced = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (approved_content, venue_id))
-        
-        elif content_type == ContentType.ATMOSPHERE_TAGS.value:
-            cursor.execute('''
-                UPDATE venues 
-                SET ml_atmosphere_tags = ?, ml_last_enhanced = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (approved_content, venue_id))
+        update_sql = _APPLY_CONTENT_SQL.get(content_type)
+        if update_sql:
+            cursor.execute(update_sql, (approved_content, venue_id))
     
     def set_admin_preference(self, preference_type: str, preference_value: str, 
                            examples: List[str] = None, weight: float = 1.0):
         """Set admin content preferences for ML training"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Check if preference exists
-            cursor.execute('''
-                SELECT id FROM admin_content_preferences 
-                WHERE preference_type = ?
-            ''', (preference_type,))
-            
-            examples_json = json.dumps(examples or [])
-            
-            if cursor.fetchone():
-                # Update existing preference
-                cursor.execute('''
-                    UPDATE admin_content_preferences 
-                    SET preference_value = ?, examples = ?, weight = ?, 
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE preference_type = ?
-                ''', (preference_value, examples_json, weight, preference_type))
-            else:
-                # Insert new preference
-                cursor.execute('''
-                    INSERT INTO admin_content_preferences 
-                    (preference_type, preference_value, examples, weight)
-                    VALUES (?, ?, ?, ?)
-                ''', (preference_type, preference_value, examples_json, weight))
-            
-            conn.commit()
+        with self._write_txn() as cursor:
+            cursor.execute(_UPSERT_ADMIN_PREFERENCE, (preference_type, preference_value, _dumps(examples or []), weight))
+        
+        # Bumped after the commit, so a concurrent read can't cache pre-edit rows
+        # under the new version
+        self._prefs_version += 1
     
     def get_admin_preferences(self) -> Dict[str, Dict]:
-        """Get all admin content preferences"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        """Get all admin content preferences
+        
+        The returned dict is shared between calls until the preferences change,
+        so callers must not modify it.
+        """
+        with self._acquire_ro() as conn:
             cursor = conn.cursor()
             
+            # Edits from this process bump the version; data_version changes
+            # whenever any other connection commits. It is per connection, so
+            # the cached read is kept per thread alongside its reader
+            version = self._prefs_version
+            cursor.execute("PRAGMA data_version")
+            stamp = (version, cursor.fetchone()[0])
+            cached = getattr(self._local, 'prefs', None)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            
+            cursor.row_factory = sqlite3.Row
             cursor.execute('''
                 SELECT * FROM admin_content_preferences 
                 ORDER BY preference_type, weight DESC
@@ -335,21 +542,28 @@ class ContentModerationSystem:
             for row in cursor.fetchall():
                 preferences[row['preference_type']] = {
                     'value': row['preference_value'],
-                    'examples': json.loads(row['examples']),
+                    'examples': _loads(row['examples']),
                     'weight': row['weight'],
                     'updated_at': row['updated_at']
                 }
             
+            self._local.prefs = (stamp, preferences)
             return preferences
     
     def get_training_data(self, content_type: ContentType = None, 
                          feedback_type: str = None, limit: int = 1000) -> List[TrainingData]:
         """Get training data for ML model training"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        return list(self.iter_training_data(content_type, feedback_type, limit))
+    
+    def iter_training_data(self, content_type: ContentType = None, 
+                           feedback_type: str = None, limit: int = 1000) -> Iterator[TrainingData]:
+        """Yield training data one item at a time, decoding rows as they are consumed"""
+        with self._acquire_ro() as conn:
             cursor = conn.cursor()
             
-            query = 'SELECT * FROM ml_training_data WHERE 1=1'
+            # Columns in TrainingData field order
+            query = ('SELECT input_features, expected_output, feedback_type, admin_notes, venue_context '
+                     'FROM ml_training_data WHERE 1=1')
             params = []
             
             if content_type:
@@ -365,61 +579,46 @@ class ContentModerationSystem:
             
             cursor.execute(query, params)
             
-            training_items = []
-            for row in cursor.fetchall():
-                item = TrainingData(
-                    input_features=json.loads(row['input_features']),
-                    expected_output=row['expected_output'],
-                    feedback_type=row['feedback_type'],
-                    admin_notes=row['admin_notes'],
-                    venue_context=json.loads(row['venue_context'])
-                )
-                training_items.append(item)
-            
-            return training_items
+            for row in cursor:
+                yield TrainingData(_loads(row[0]), row[1], row[2], row[3], _loads(row[4]))
     
     def get_moderation_stats(self) -> Dict:
         """Get moderation statistics for admin dashboard"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._acquire_ro() as conn:
             cursor = conn.cursor()
             
-            # Pending items count
-            cursor.execute("SELECT COUNT(*) FROM content_moderation WHERE status = 'pending'")
-            pending_count = cursor.fetchone()[0]
-            
-            # Approval rate
+            # Totals and last-7-days counts per status in one pass over
+            # idx_cm_pending_created, which covers (status, created_at)
             cursor.execute('''
-                SELECT 
-                    COUNT(CASE WHEN status = 'approved' THEN 1 END) as approved,
-                    COUNT(CASE WHEN status = 'rejected' THEN 1 END) as rejected,
-                    COUNT(*) as total
-                FROM content_moderation 
-                WHERE status IN ('approved', 'rejected')
+                SELECT status, COUNT(*),
+                       COUNT(CASE WHEN created_at >= datetime('now', '-7 days') THEN 1 END)
+                FROM content_moderation
+                GROUP BY status
             ''')
-            approval_stats = cursor.fetchone()
+            status_counts = {}
+            recent_activity = {}
+            for status, total, recent in cursor.fetchall():
+                status_counts[status] = total
+                if recent:
+                    recent_activity[status] = recent
             
             # Training data count
             cursor.execute("SELECT COUNT(*) FROM ml_training_data")
             training_data_count = cursor.fetchone()[0]
             
-            # Recent activity
-            cursor.execute('''
-                SELECT status, COUNT(*) 
-                FROM content_moderation 
-                WHERE created_at >= datetime('now', '-7 days')
-                GROUP BY status
-            ''')
-            recent_activity = dict(cursor.fetchall())
+            pending_count = status_counts.get('pending', 0)
+            approved = status_counts.get('approved', 0)
+            rejected = status_counts.get('rejected', 0)
             
             approval_rate = 0
-            if approval_stats[2] > 0:  # total > 0
-                approval_rate = approval_stats[0] / approval_stats[2]  # approved / total
+            if approved + rejected > 0:
+                approval_rate = approved / (approved + rejected)
             
             return {
                 'pending_items': pending_count,
                 'approval_rate': approval_rate,
-                'total_approved': approval_stats[0],
-                'total_rejected': approval_stats[1],
+                'total_approved': approved,
+                'total_rejected': rejected,
                 'training_data_points': training_data_count,
                 'recent_activity': recent_activity
             }
@@ -427,9 +626,7 @@ class ContentModerationSystem:
     def bulk_approve_by_criteria(self, content_type: ContentType = None, 
                                min_confidence: float = 0.8) -> int:
         """Bulk approve high-confidence items matching criteria"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self._write_txn() as cursor:
             query = '''
                 UPDATE content_moderation 
                 SET status = 'approved', reviewed_at = CURRENT_TIMESTAMP, 
@@ -442,23 +639,32 @@ class ContentModerationSystem:
                 query += ' AND content_type = ?'
                 params.append(content_type.value)
             
-            cursor.execute(query, params)
-            approved_count = cursor.rowcount
+            cursor.execute(query + ' RETURNING id', params)
+            approved_ids = [row[0] for row in cursor.fetchall()]
+            approved_count = len(approved_ids)
             
-            # Apply approved content to venues
-            cursor.execute('''
-                SELECT cm.*, v.name, v.venue_type, v.neighborhood, v.instagram_handle
-                FROM content_moderation cm
-                LEFT JOIN venues v ON cm.venue_id = v.id
-                WHERE cm.status = 'approved' AND cm.reviewed_by = 'system_auto_approve'
-            ''')
+            # Apply approved content to venues, for just the rows approved above
+            cursor.execute(_SELECT_MODERATION_ROWS + '''
+                WHERE cm.id IN (SELECT value FROM json_each(?))
+            ''', (_dumps(approved_ids),))
             
-            for row in cursor.fetchall():
-                self._apply_approved_content(cursor, row)
-                # Create positive training data
-                self._create_training_data(cursor, row, ModerationStatus.APPROVED, 'Auto-approved for high confidence')
+            rows = cursor.fetchall()
+            
+            # One executemany per venue column instead of an UPDATE per row
+            venue_updates = {}
+            for row in rows:
+                if row[2] in _APPLY_CONTENT_SQL:
+                    venue_updates.setdefault(row[2], []).append((row[4], row[1]))
+            for content_type_value, update_params in venue_updates.items():
+                cursor.executemany(_APPLY_CONTENT_SQL[content_type_value], update_params)
+            
+            # Create positive training data, encoding the whole batch in one _dumps
+            if rows:
+                cursor.execute(_INSERT_TRAINING_DATA_JSON, (_dumps([
+                    self._training_data_record(row, ModerationStatus.APPROVED, 'Auto-approved for high confidence')
+                    for row in rows
+                ]),))
             
-            conn.commit()
             return approved_count
 
 # Integration with existing ML system
@@ -478,23 +684,15 @@ class ModeratedMLEnhancer:
         # Submit each type of content for moderation
         venue_id = venue_data['id']
         
-        # Description moderation
-        desc_mod_id = self.moderation_system.submit_for_moderation(
-            venue_id=venue_id,
-            content_type=ContentType.VENUE_DESCRIPTION,
-            original_content=venue_data.get('description', ''),
-            ai_generated_content=enhancement.enhanced_description,
-            confidence_score=0.8  # Would use actual confidence from ML
-        )
-        
-        # Atmosphere tags moderation
-        tags_mod_id = self.moderation_system.submit_for_moderation(
-            venue_id=venue_id,
-            content_type=ContentType.ATMOSPHERE_TAGS,
-            original_content='',
-            ai_generated_content=','.join(enhancement.atmosphere_tags),
-            confidence_score=0.75
-        )
+        # Description and atmosphere tags moderation, submitted together; the
+        # commit runs on a worker thread so the event loop isn't blocked on fsync
+        desc_mod_id, tags_mod_id = await asyncio.to_thread(self.moderation_system.submit_many, [
+            (venue_id, ContentType.VENUE_DESCRIPTION, venue_data.get('description', ''),
+             enhancement.enhanced_description,
+             0.8),  # Would use actual confidence from ML
+            (venue_id, ContentType.ATMOSPHERE_TAGS, '',
+             ','.join(enhancement.atmosphere_tags), 0.75)
+        ])
         
         return {
             'enhancement': enhancement,
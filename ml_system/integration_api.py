@@ -13,7 +13,7 @@ from datetime import datetime
 import json
 from contextlib import asynccontextmanager
 
-from ml_system.automated_venue_discovery import AutomatedVenueDiscovery, VenueCandidate
+from ml_system.automated_venue_discovery import AutomatedVenueDiscovery, VenueCandidate, create_http_session
 from ml_system.smart_content_enhancer import SmartContentEnhancer, VenueEnhancement
 from ml_system.ml_models import MLModelManager
 
@@ -65,16 +65,18 @@ class ScheduledTaskRequest(BaseModel):
 ml_manager = None
 discovery_system = None
 content_enhancer = None
+http_session = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize ML components on startup"""
-    global ml_manager, discovery_system, content_enhancer
+    global ml_manager, discovery_system, content_enhancer, http_session
     
     try:
-        # Initialize ML components
+        # Initialize ML components; outbound calls share one pooled session
+        http_session = create_http_session()
         ml_manager = MLModelManager()
-        discovery_system = AutomatedVenueDiscovery()
+        discovery_system = AutomatedVenueDiscovery(http_session=http_session)
         content_enhancer = SmartContentEnhancer()
         
         # Load pre-trained models if available
@@ -93,6 +95,8 @@ async def lifespan(app: FastAPI):
     
     # Cleanup on shutdown
     logging.info("Shutting down ML/AI system")
+    if http_session:
+        await http_session.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -200,8 +204,7 @@ async def enhance_venues(
         
         # Enhance venues
         enhancements = []
-        for venue in venues_to_enhance:
-            enhancement = await enhancer.enhance_venue(venue)
+        for enhancement in await enhancer.enhance_venues_batch(venues_to_enhance):
             enhancements.append({
                 'venue_id': enhancement.venue_id,
                 'enhanced_description': enhancement.enhanced_description,
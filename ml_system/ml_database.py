@@ -125,6 +125,25 @@ class MLDatabase:
                 )
             """)
             
+            # Venues found by automated discovery
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS discovered_venues (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    address TEXT,
+                    latitude REAL,
+                    longitude REAL,
+                    venue_type TEXT,
+                    phone TEXT,
+                    website TEXT,
+                    rating REAL,
+                    source TEXT,
+                    confidence_score REAL,
+                    discovered_at TIMESTAMP,
+                    raw_data TEXT  -- JSON
+                )
+            """)
+            
             # Create indexes for performance
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_instagram_venue ON instagram_posts(venue_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_instagram_date ON instagram_posts(posted_at)")
@@ -290,6 +309,22 @@ class MLDatabase:
                 'sample_size': len(predictions)
             }
     
+    # Discovery methods
+    def store_discovery_batch(self, venues: List[Dict]):
+        """Store a batch of discovered venues in one transaction"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT INTO discovered_venues
+                (name, address, latitude, longitude, venue_type, phone, website,
+                 rating, source, confidence_score, discovered_at, raw_data)
+                VALUES (:name, :address, :latitude, :longitude, :venue_type, :phone, :website,
+                        :rating, :source, :confidence_score, :discovered_at, :raw_data)
+            """, venues)
+            
+            conn.commit()
+    
     # Time series methods
     def add_time_series_data(self, venue_id: str, metric_name: str, 
                             value: float, timestamp: datetime):
@@ -308,6 +308,10 @@ class SmartContentEnhancer:
             # Return basic enhancement on error
             return self._create_basic_enhancement(venue_data)
     
+    async def enhance_venues_batch(self, venues: List[Dict]) -> List[VenueEnhancement]:
+        """Enhance many venues concurrently, preserving input order"""
+        return list(await asyncio.gather(*(self.enhance_venue(venue) for venue in venues)))
+    
     def _extract_key_features(self, venue_data: Dict, social_analysis: Dict) -> List[str]:
         """Extract key features for the venue"""
         features = []
@@ -533,13 +537,7 @@ class SmartContentEnhancer:
 async def enhance_venue_batch(venue_list: List[Dict]) -> List[VenueEnhancement]:
     """Enhance multiple venues in batch"""
     enhancer = SmartContentEnhancer()
-    
-    enhancements = []
-    for venue in venue_list:
-        enhancement = await enhancer.enhance_venue(venue)
-        enhancements.append(enhancement)
-    
-    return enhancements
+    return await enhancer.enhance_venues_batch(venue_list)
 
 if __name__ == "__main__":
     # Example usage
@@ -39,10 +39,8 @@ def optimize_database(db_path="nightlife.db"):
         ("idx_admin_username", "admin_users", "username"),
         ("idx_admin_email", "admin_users", "email"),
         
-        # Analytics indexes
-        ("idx_analytics_event_type", "analytics_events", "event_type"),
+        # Analytics indexes (venue/type lookups use composites from analytics.py)
         ("idx_analytics_timestamp", "analytics_events", "timestamp"),
-        ("idx_analytics_venue_id", "analytics_events", "venue_id"),
         
         # Audit log indexes
         ("idx_audit_action", "audit_log", "action"),
@@ -51,7 +49,6 @@ def optimize_database(db_path="nightlife.db"):
         
         # API keys indexes
         ("idx_api_keys_key", "api_keys", "key"),
-        ("idx_api_keys_active", "api_keys", "is_active"),
     ]
     
     # Create indexes
@@ -68,9 +65,13 @@ def optimize_database(db_path="nightlife.db"):
     composite_indexes = [
         ("idx_venues_neighborhood_type", "venues", "(neighborhood, venue_type)"),
         ("idx_content_venue_created", "content", "(venue_id, created_at DESC)"),
-        ("idx_analytics_type_timestamp", "analytics_events", "(event_type, timestamp DESC)"),
+        # Partial index: only active keys are ever looked up
+        ("idx_api_keys_key_active", "api_keys", "(key) WHERE is_active = 1"),
     ]
     
+    # Low-cardinality boolean index replaced by the partial index above
+    cursor.execute("DROP INDEX IF EXISTS idx_api_keys_active")
+    
     for index_name, table, columns in composite_indexes:
         try:
             cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} {columns}")
@@ -116,6 +116,178 @@ async def test_venue_discovery():
         print(f"❌ Venue discovery test failed: {e}")
         return False
 
+def test_null_coordinate_candidates():
+    """Test that a Yelp record with null coordinates is rejected, not fatal"""
+    print("🔍 Testing null-coordinate discovery candidates...")
+    
+    import tempfile
+    from unittest import mock
+    from ml_system.automated_venue_discovery import AutomatedVenueDiscovery, DataSourceManager
+    
+    async def no_results(self, *args, **kwargs):
+        return []
+    
+    async def yelp_null_coordinates(self, term, location="New York, NY"):
+        return [self._parse_yelp_business({
+            'name': 'Nowhere Lounge',
+            'coordinates': {'latitude': None, 'longitude': None},
+            'location': {'display_address': ['1 Nowhere St']},
+            'categories': [{'title': 'Lounges'}]
+        })]
+    
+    # Discovery writes its caches, log and ML database relative to the working
+    # directory; keep them out of the project
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        os.makedirs('ml_system')
+        try:
+            with mock.patch.object(DataSourceManager, 'fetch_nyc_cultural_organizations', no_results), \
+                 mock.patch.object(DataSourceManager, 'fetch_nyc_events', no_results), \
+                 mock.patch.object(DataSourceManager, 'fetch_google_places', no_results), \
+                 mock.patch.object(DataSourceManager, 'fetch_yelp_businesses', yelp_null_coordinates):
+                stats = asyncio.run(AutomatedVenueDiscovery().discover_venues(['bars']))
+        finally:
+            os.chdir(original_cwd)
+    
+    assert stats['total_found'] == 1, f"Unexpected discovery stats: {stats}"
+    assert stats['rejected'] == 1, f"Unexpected discovery stats: {stats}"
+    assert stats['added'] == 0, f"Unexpected discovery stats: {stats}"
+    
+    print("✅ Null-coordinate candidate rejected")
+
+def test_batch_dedup_matches_single():
+    """Test that batch deduplication catches every duplicate the single check does"""
+    print("🔍 Testing batch deduplication against single checks...")
+    
+    from ml_system.automated_venue_discovery import DeduplicationEngine, VenueCandidate
+    
+    existing = [
+        {'id': 1, 'name': 'The Blue Room', 'latitude': 40.7210, 'longitude': -73.9880},
+        {'id': 2, 'name': 'Brooklyn Bowl', 'latitude': 40.7219, 'longitude': -73.9573},
+        {'id': 3, 'name': 'Nowadays', 'latitude': 40.7040, 'longitude': -73.9180},
+        {'id': 4, 'name': 'Bar Sardine', 'latitude': 40.7330, 'longitude': -74.0050},
+    ]
+    engine = DeduplicationEngine(existing)
+    
+    def candidate(name, latitude, longitude):
+        return VenueCandidate(name=name, address='', latitude=latitude, longitude=longitude, source='test')
+    
+    candidates = [
+        candidate('The Blue Room', 40.0, -73.0),         # exact name, far away
+        candidate('Room Blue The', 40.7211, -73.9881),   # same words, same place
+        candidate('Brooklyn Bowl', 40.7219, -73.9573),   # exact name, same place
+        candidate('Nowadays', 40.8, -73.8),              # exact name, elsewhere
+        candidate('Sardine', 40.7330, -74.0050),         # partial name, same place
+        candidate('Elsewhere', 40.7093, -73.9232),       # unrelated
+        candidate('Bar Sardine', 41.0, -74.5),           # exact name, far away
+    ]
+    
+    # The batch path adds a fuzzy name match on top of the single checks, so
+    # it may flag more, but never fewer
+    batch = engine.batch_is_duplicate(candidates)
+    single = [engine.is_duplicate(c) for c in candidates]
+    for c, batch_result, single_result in zip(candidates, batch, single):
+        if single_result[0]:
+            assert batch_result[0], f"{c.name}: single check matched {single_result[1]}, batch did not"
+    
+    assert batch[1] == (True, existing[0])
+    assert batch[5] == (False, None)
+    
+    print("✅ Batch deduplication covers the single checks")
+
+def _moderation_system(tmp_dir):
+    """ContentModerationSystem over a temp database holding one venue"""
+    from ml_system.content_moderation import ContentModerationSystem
+    
+    db_path = os.path.join(tmp_dir, 'moderation.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE venues (
+            id INTEGER PRIMARY KEY, name TEXT, venue_type TEXT, neighborhood TEXT,
+            instagram_handle TEXT, ml_enhanced_description TEXT,
+            ml_atmosphere_tags TEXT, ml_last_enhanced TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO venues (id, name, venue_type, neighborhood, instagram_handle)
+        VALUES (1, 'Bar Sardine', 'cocktail_lounge', 'West Village', '@barsardine')
+    ''')
+    conn.commit()
+    conn.close()
+    return ContentModerationSystem(db_path), db_path
+
+def test_bulk_approve_is_idempotent():
+    """Test that a second bulk approve finds nothing new to approve or train on"""
+    print("🔍 Testing repeated bulk approval...")
+    
+    import tempfile
+    from ml_system.content_moderation import ContentType
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        moderation, db_path = _moderation_system(tmp_dir)
+        try:
+            moderation.submit_for_moderation('1', ContentType.VENUE_DESCRIPTION, '', 'Tinned fish and martinis', 0.9)
+            moderation.submit_for_moderation('1', ContentType.ATMOSPHERE_TAGS, '', '["cozy"]', 0.95)
+            moderation.submit_for_moderation('1', ContentType.ATMOSPHERE_TAGS, '', '["loud"]', 0.3)
+            
+            assert moderation.bulk_approve_by_criteria() == 2
+            assert moderation.bulk_approve_by_criteria() == 0
+            
+            conn = sqlite3.connect(db_path)
+            training_rows = conn.execute('SELECT COUNT(*) FROM ml_training_data').fetchone()[0]
+            pending = conn.execute("SELECT COUNT(*) FROM content_moderation WHERE status = 'pending'").fetchone()[0]
+            conn.close()
+            assert training_rows == 2, f"expected 2 training rows, found {training_rows}"
+            assert pending == 1
+        finally:
+            moderation.close()
+    
+    print("✅ Second bulk approval was a no-op")
+
+def test_training_data_venue_context():
+    """Test that training data records the venue context and confidence"""
+    print("🔍 Testing training data venue context...")
+    
+    import json
+    import tempfile
+    from ml_system.content_moderation import ContentType, ModerationStatus
+    
+    expected_context = {
+        'name': 'Bar Sardine',
+        'venue_type': 'cocktail_lounge',
+        'neighborhood': 'West Village',
+        'instagram_handle': '@barsardine'
+    }
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        moderation, db_path = _moderation_system(tmp_dir)
+        try:
+            reviewed_id = moderation.submit_for_moderation('1', ContentType.VENUE_DESCRIPTION, 'Old copy', 'New copy', 0.7)
+            moderation.moderate_content(reviewed_id, ModerationStatus.APPROVED, 'admin')
+            moderation.submit_for_moderation('1', ContentType.ATMOSPHERE_TAGS, '', '["cozy"]', 0.9)
+            moderation.bulk_approve_by_criteria()
+            
+            conn = sqlite3.connect(db_path)
+            rows = conn.execute(
+                'SELECT content_type, input_features, venue_context FROM ml_training_data ORDER BY id'
+            ).fetchall()
+            conn.close()
+        finally:
+            moderation.close()
+    
+    assert [row[0] for row in rows] == ['venue_description', 'atmosphere_tags']
+    for (content_type, input_features, venue_context), confidence in zip(rows, (0.7, 0.9)):
+        features = json.loads(input_features)
+        assert json.loads(venue_context) == expected_context, f"{content_type}: {venue_context}"
+        assert features['venue_name'] == 'Bar Sardine'
+        assert features['neighborhood'] == 'West Village'
+        assert features['has_instagram'] is True
+        assert features['confidence_score'] == confidence, f"{content_type}: {features}"
+    assert json.loads(rows[0][1])['original_content_length'] == len('Old copy')
+    
+    print("✅ Training data carries venue context and confidence")
+
 async def test_content_enhancement():
     """Test content enhancement functionality"""
     print("🔍 Testing content enhancement...")
@@ -185,6 +357,10 @@ async def main():
         ("ML Initialization", test_ml_initialization),
         ("Configuration", test_configuration),
         ("Venue Discovery", test_venue_discovery),
+        ("Null-Coordinate Candidates", test_null_coordinate_candidates),
+        ("Batch Deduplication", test_batch_dedup_matches_single),
+        ("Repeated Bulk Approval", test_bulk_approve_is_idempotent),
+        ("Training Data Venue Context", test_training_data_venue_context),
         ("Content Enhancement", test_content_enhancement)
     ]
     
@@ -200,9 +376,11 @@ async def main():
             if asyncio.iscoroutinefunction(test_func):
                 result = await test_func()
             else:
-                result = test_func()
+                # Off the event loop, so sync tests can asyncio.run() their own
+                result = await asyncio.to_thread(test_func)
             
-            if result:
+            # Assert-style tests return None and fail by raising
+            if result is None or result:
                 passed += 1
                 print(f"✅ {test_name} PASSED")
             else:
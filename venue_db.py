@@ -1,7 +1,59 @@
 import sqlite3
 from datetime import datetime
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# Column order used by add_venue_rows()
+VENUE_COLUMNS = ("name", "neighborhood", "instagram_handle", "venue_type",
+                 "address", "description", "busy_nights", "price_range")
+
+# Bit positions for busy_nights_mask (bit 0 = Monday ... bit 6 = Sunday)
+DAYS = {"Mon": 0, "Tue": 1, "Wed": 2, "Thu": 3, "Fri": 4, "Sat": 5, "Sun": 6}
+
+try:
+    # Native build from build_ingest_ext.py, when it has been compiled
+    from atlas_ingest import busy_mask as _busy_mask
+except ImportError:
+    def _busy_mask(busy_nights: str) -> int:
+        mask = 0
+        for day in busy_nights.split(','):
+            bit = DAYS.get(day.strip()[:3].title())
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+def busy_nights_mask(busy_nights: Optional[str]) -> Optional[int]:
+    """Encode 'Thu,Fri,Sat' or 'Thursday, Friday' as a day-of-week bitmask"""
+    if not busy_nights:
+        return None
+    return _busy_mask(busy_nights)
+
+def busy_nights_mask_sql(column: str) -> str:
+    """SQL expression computing busy_nights_mask() from `column`, for triggers"""
+    days = " | ".join(
+        f"((instr(',' || lower(replace({column}, ' ', '')), ',{day.lower()}') > 0) << {bit})"
+        for day, bit in DAYS.items()
+    )
+    return f"CASE WHEN {column} IS NULL OR {column} = '' THEN NULL ELSE {days} END"
+
+# Stored in PRAGMA user_version; bump whenever _create_schema changes
+SCHEMA_VERSION = 3
+
+# Lookup tables for venue attributes repeated across many rows
+LOOKUP_TABLES = ("neighborhoods", "venue_types")
+
+def get_or_create(cursor: sqlite3.Cursor, table: str, name: str, cache: Dict[Tuple[str, str], int]) -> int:
+    """Return the id of `name` in a lookup table, inserting it if needed"""
+    key = (table, name)
+    if key not in cache:
+        cursor.execute(f'INSERT OR IGNORE INTO {table} (name) VALUES (?)', (name,))
+        cursor.execute(f'SELECT id FROM {table} WHERE name = ?', (name,))
+        cache[key] = cursor.fetchone()[0]
+    return cache[key]
+
+def normalize_address(address: str) -> str:
+    """Canonical form of an address used as the geocode cache key"""
+    return address.strip().lower()
 
 @dataclass
 class Venue:
@@ -22,13 +74,49 @@ class VenueDatabase:
     
     def __init__(self, db_path: str = "nightlife.db"):
         self.db_path = db_path
+        self._lookup_cache: Dict[Tuple[str, str], int] = {}
         self.create_tables()
     
+    def _connect(self, isolation_level: Optional[str] = "") -> sqlite3.Connection:
+        """Open a connection tuned for bulk writes
+        
+        Pass isolation_level=None to manage transactions with explicit BEGIN/COMMIT.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=isolation_level)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')
+        return conn
+    
     def create_tables(self):
-        """Create the venues table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
+        """Create or migrate the schema, unless it is already at SCHEMA_VERSION"""
+        conn = self._connect(isolation_level=None)
         cursor = conn.cursor()
         
+        try:
+            # Current schema: nothing to do, and no write lock taken
+            if cursor.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+                return
+            
+            # WAL is persistent, so setting it once here covers every later connection
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
+            # Run all schema changes and the backfill as one transaction
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                # Another process may have migrated while we waited for the lock
+                if cursor.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                    self._create_schema(cursor)
+                    cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+    
+    def _create_schema(self, cursor: sqlite3.Cursor):
+        """Issue the schema statements on an open transaction"""
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS venues (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -44,22 +132,101 @@ class VenueDatabase:
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        # Precomputed day bitmask so "busy tonight" is an integer test, not a LIKE scan
+        cursor.execute('PRAGMA table_info(venues)')
+        columns = [column[1] for column in cursor.fetchall()]
+        if 'busy_nights_mask' not in columns:
+            cursor.execute('ALTER TABLE venues ADD COLUMN busy_nights_mask INTEGER')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_venues_busy_mask ON venues(busy_nights_mask)')
+        
+        # Backfill rows written before the column existed
+        cursor.execute('SELECT id, busy_nights FROM venues WHERE busy_nights_mask IS NULL AND busy_nights IS NOT NULL')
+        cursor.executemany('UPDATE venues SET busy_nights_mask = ? WHERE id = ?',
+                           [(busy_nights_mask(busy), venue_id) for venue_id, busy in cursor.fetchall()])
+        
+        # Scripts that insert into venues directly skip add_venue, so fill the mask in SQL
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_venues_busy_mask_insert
+            AFTER INSERT ON venues WHEN NEW.busy_nights_mask IS NULL AND NEW.busy_nights IS NOT NULL
+            BEGIN
+                UPDATE venues SET busy_nights_mask = {busy_nights_mask_sql('NEW.busy_nights')} WHERE id = NEW.id;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_venues_busy_mask_update
+            AFTER UPDATE OF busy_nights ON venues
+            BEGIN
+                UPDATE venues SET busy_nights_mask = {busy_nights_mask_sql('NEW.busy_nights')} WHERE id = NEW.id;
+            END
+        ''')
+        
+        # Integer keys for neighborhood / venue_type; the text columns stay for readers
+        for table in LOOKUP_TABLES:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL
+                )
+            ''')
+        if 'neighborhood_id' not in columns:
+            cursor.execute('ALTER TABLE venues ADD COLUMN neighborhood_id INTEGER REFERENCES neighborhoods(id)')
+        if 'venue_type_id' not in columns:
+            cursor.execute('ALTER TABLE venues ADD COLUMN venue_type_id INTEGER REFERENCES venue_types(id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_venues_neighborhood_id ON venues(neighborhood_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_venues_venue_type_id ON venues(venue_type_id)')
+        
+        # Backfill lookup ids for rows inserted before the columns existed
+        cursor.execute('INSERT OR IGNORE INTO neighborhoods (name) SELECT DISTINCT neighborhood FROM venues WHERE neighborhood_id IS NULL')
+        cursor.execute('''
+            UPDATE venues SET neighborhood_id = (SELECT id FROM neighborhoods WHERE name = venues.neighborhood)
+            WHERE neighborhood_id IS NULL
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO venue_types (name) SELECT DISTINCT venue_type FROM venues WHERE venue_type_id IS NULL')
+        cursor.execute('''
+            UPDATE venues SET venue_type_id = (SELECT id FROM venue_types WHERE name = venues.venue_type)
+            WHERE venue_type_id IS NULL
+        ''')
+        
+        # add_venue/add_venue_rows set the ids themselves; this covers direct inserts
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_venues_lookup_ids_insert
+            AFTER INSERT ON venues WHEN NEW.neighborhood_id IS NULL OR NEW.venue_type_id IS NULL
+            BEGIN
+                INSERT OR IGNORE INTO neighborhoods (name) VALUES (NEW.neighborhood);
+                INSERT OR IGNORE INTO venue_types (name) VALUES (NEW.venue_type);
+                UPDATE venues SET
+                    neighborhood_id = coalesce(neighborhood_id, (SELECT id FROM neighborhoods WHERE name = NEW.neighborhood)),
+                    venue_type_id = coalesce(venue_type_id, (SELECT id FROM venue_types WHERE name = NEW.venue_type))
+                WHERE id = NEW.id;
+            END
+        ''')
+        
+        # Geocoding results keyed by normalized address
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                address TEXT PRIMARY KEY,
+                lat REAL,
+                lng REAL,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
     
     def add_venue(self, venue: Venue) -> int:
         """Add a new venue to the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
             cursor.execute('''
                 INSERT INTO venues (name, neighborhood, instagram_handle, venue_type, 
-                                  address, description, busy_nights, price_range)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                                  address, description, busy_nights, price_range,
+                                  busy_nights_mask, neighborhood_id, venue_type_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (venue.name, venue.neighborhood, venue.instagram_handle, 
                   venue.venue_type, venue.address, venue.description, 
-                  venue.busy_nights, venue.price_range))
+                  venue.busy_nights, venue.price_range, busy_nights_mask(venue.busy_nights),
+                  get_or_create(cursor, 'neighborhoods', venue.neighborhood, self._lookup_cache),
+                  get_or_create(cursor, 'venue_types', venue.venue_type, self._lookup_cache)))
             
             venue_id = cursor.lastrowid
             conn.commit()
@@ -67,14 +234,59 @@ class VenueDatabase:
             return venue_id
             
         except sqlite3.IntegrityError:
+            conn.rollback()
+            self._lookup_cache.clear()
             print(f"❌ Venue with Instagram handle @{venue.instagram_handle} already exists")
             return -1
         finally:
             conn.close()
     
+    def add_venues(self, venues: Sequence[Venue]) -> int:
+        """Add many venues in a single transaction, returning the number inserted (-1 on failure)"""
+        return self.add_venue_rows([(venue.name, venue.neighborhood, venue.instagram_handle, 
+                                     venue.venue_type, venue.address, venue.description, 
+                                     venue.busy_nights, venue.price_range) for venue in venues])
+    
+    def add_venue_rows(self, rows: List[tuple]) -> int:
+        """Bulk insert parameter tuples ordered as VENUE_COLUMNS
+        
+        Rows whose instagram_handle already exists are skipped by the UNIQUE
+        constraint; the return value counts only rows actually inserted, or is
+        -1 if the batch was rolled back.
+        """
+        if not rows:
+            return 0
+        
+        conn = self._connect(isolation_level=None)
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cache = self._lookup_cache
+            cursor.executemany('''
+                INSERT OR IGNORE INTO venues (name, neighborhood, instagram_handle, venue_type, 
+                                  address, description, busy_nights, price_range,
+                                  busy_nights_mask, neighborhood_id, venue_type_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [row + (busy_nights_mask(row[6]),
+                         get_or_create(cursor, 'neighborhoods', row[1], cache),
+                         get_or_create(cursor, 'venue_types', row[3], cache)) for row in rows])
+            
+            added = cursor.rowcount
+            cursor.execute('COMMIT')
+            return added
+            
+        except sqlite3.IntegrityError as e:
+            cursor.execute('ROLLBACK')
+            self._lookup_cache.clear()
+            print(f"❌ Bulk insert failed, no venues added: {e}")
+            return -1
+        finally:
+            conn.close()
+    
     def get_all_venues(self) -> List[Venue]:
         """Get all venues from the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('SELECT * FROM venues ORDER BY name')
@@ -99,9 +311,109 @@ class VenueDatabase:
         
         return venues
     
+    def get_venues_by_ids(self, venue_ids: Sequence[int]) -> List[Venue]:
+        """Get the venues with the given ids in a single query
+        
+        Venues come back in the order of venue_ids; ids with no venue are left out.
+        """
+        if not venue_ids:
+            return []
+        
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        placeholders = ','.join('?' * len(venue_ids))
+        cursor.execute(f'SELECT * FROM venues WHERE id IN ({placeholders})', 
+                       tuple(venue_ids))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        venues_by_id = {}
+        for row in rows:
+            venues_by_id[row[0]] = Venue(
+                venue_id=row[0],
+                name=row[1],
+                neighborhood=row[2],
+                instagram_handle=row[3],
+                venue_type=row[4],
+                address=row[5],
+                description=row[6],
+                busy_nights=row[7],
+                price_range=row[8],
+                created_at=row[9]
+            )
+        
+        return [venues_by_id[venue_id] for venue_id in venue_ids if venue_id in venues_by_id]
+    
+    def get_instagram_handles(self) -> Set[str]:
+        """Return every stored instagram_handle (served from the UNIQUE index)"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT instagram_handle FROM venues')
+        handles = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        
+        return handles
+    
+    def count_venues(self) -> int:
+        """Count venues without loading every row"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT COUNT(*) FROM venues')
+        count = cursor.fetchone()[0]
+        conn.close()
+        
+        return count
+    
+    def preview(self, n: int = 10) -> Tuple[List[sqlite3.Row], int]:
+        """Return the first n venues (name, handle, neighborhood) and the total count"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT name, instagram_handle, neighborhood FROM venues ORDER BY name LIMIT ?', (n,))
+        rows = cursor.fetchall()
+        cursor.execute('SELECT COUNT(*) FROM venues')
+        total = cursor.fetchone()[0]
+        conn.close()
+        
+        return rows, total
+    
+    def get_cached_geocodes(self, addresses: List[str]) -> Dict[str, Tuple[float, float]]:
+        """Look up cached coordinates, returning {address: (lat, lng)} for hits"""
+        keys = {normalize_address(address): address for address in addresses}
+        if not keys:
+            return {}
+        
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        placeholders = ','.join('?' * len(keys))
+        cursor.execute(f'SELECT address, lat, lng FROM geocode_cache WHERE address IN ({placeholders})',
+                       list(keys))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return {keys[row[0]]: (row[1], row[2]) for row in rows}
+    
+    def cache_geocodes(self, coordinates: Dict[str, Tuple[float, float]]):
+        """Store {address: (lat, lng)} results in the geocode cache"""
+        if not coordinates:
+            return
+        
+        conn = self._connect()
+        conn.executemany('''
+            INSERT OR REPLACE INTO geocode_cache (address, lat, lng, fetched_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ''', [(normalize_address(address), lat, lng) for address, (lat, lng) in coordinates.items()])
+        conn.commit()
+        conn.close()
+    
     def get_venues_by_neighborhood(self, neighborhood: str) -> List[Venue]:
         """Get venues filtered by neighborhood"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('SELECT * FROM venues WHERE neighborhood = ? ORDER BY name', (neighborhood,))